@@ -5,17 +5,145 @@ HTTP server for web-based video and image player with real-time SSE updates
 """
 
 from http.server import HTTPServer, BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor, wait
+import array
+import ast
+import email.utils
 import json
 import os
 import sys
 from datetime import datetime
+import functools
+import hashlib
 import logging
 import mimetypes
 import socket
 import threading
 import queue
+import shutil
 import time
 import urllib.parse
+import zlib
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json handles everything, just slower
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # optional; play/navigate bodies fall back to json_loads
+    simdjson = None
+
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import FileTarget
+except ImportError:  # optional; uploads fall back to the line-by-line multipart reader
+    StreamingFormDataParser = None
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # optional; list_assets() falls back to an mtime check
+    INotify = None
+
+# Both accept any bytes-like object, including a memoryview over a request buffer
+if orjson:
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    def json_loads(data):
+        """Parse JSON from bytes or a buffer"""
+        return json.loads(bytes(data))
+    
+    def json_dumps(obj):
+        """Serialize obj to UTF-8 JSON bytes"""
+        return json.dumps(obj).encode('utf-8')
+
+# simdjson Parsers keep their buffers between documents but are not thread-safe,
+# so handler threads borrow one from this pool instead of sharing a single instance
+_simdjson_parsers = queue.SimpleQueue()
+
+def parse_hot_json(body):
+    """Parse a card-scan request body, using a reused simdjson Parser when available"""
+    if simdjson is None:
+        return json_loads(body)
+    
+    try:
+        parser = _simdjson_parsers.get_nowait()
+    except queue.Empty:
+        parser = simdjson.Parser()
+    try:
+        return parser.parse(bytes(body), recursive=True)
+    finally:
+        _simdjson_parsers.put(parser)
+
+def sse_frame(event_type, data):
+    """Encode a single Server-Sent Events frame"""
+    return b'event: %s\ndata: %s\n\n' % (event_type.encode('utf-8'), json_dumps(data))
+
+class RequestError(Exception):
+    """A client error, sent back as a plain-text response by do_POST"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# RFID triggers and config edits are a few KB at most
+MAX_POST_BYTES = 64 * 1024
+
+# Socket read size for multipart uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Seconds between keep-alive frames on idle SSE connections
+SSE_KEEPALIVE_INTERVAL = 30
+
+# Send timeout on SSE sockets, so a stalled client frees its broadcast worker;
+# also how long a broadcast waits before giving up on sends still queued
+SSE_BROADCAST_TIMEOUT = 2.0
+
+# HTML/JSON bodies above this size are gzipped for clients that accept it
+COMPRESS_MIN_BYTES = 512
+_COMPRESSIBLE_TYPES = ('text/html', 'application/json')
+
+# Read/write size when streaming asset files without sendfile; each write is one send() syscall
+STREAM_CHUNK_SIZE = 1024 * 1024
+HAVE_SENDFILE = hasattr(os, 'sendfile')
+HAVE_FADVISE = hasattr(os, 'posix_fadvise')
+
+# Socket send buffer for video responses, so the kernel can queue more between writes
+VIDEO_SNDBUF_BYTES = 1024 * 1024
+
+# Fixed-shape bodies for the card-scan responses; each %s is one json_dumps()'d value,
+# so only the varying fields are serialized per request
+_PLAY_RESPONSE = (b'{"success":true,"card_id":%s,"asset_file":%s,"asset_index":%s,'
+                  b'"total_assets":%s,"message":%s,"timestamp":%s,"web_player_url":%s}')
+_NAVIGATE_RESPONSE = (b'{"success":true,"card_id":%s,"direction":%s,"asset_file":%s,'
+                      b'"asset_index":%s,"total_assets":%s,"message":%s}')
+_CARD_REMOVED_RESPONSE = (b'{"success":%s,"card_id":%s,"action":"card_removed",'
+                          b'"message":%s,"timestamp":%s}')
+
+# Status line and fixed headers of a 200 JSON response; Date and Content-Length follow
+_JSON_OK_HEAD = (
+    b'HTTP/1.1 200 OK\r\n'
+    b'Server: %s %s\r\n'
+    b'Content-Type: application/json\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+) % (BaseHTTPRequestHandler.server_version.encode(), BaseHTTPRequestHandler.sys_version.encode())
+
+# Constant header blocks, encoded once instead of formatted per response
+_CORS_HEADER_BYTES = b'Access-Control-Allow-Origin: *\r\n'
+_ASSET_CORS_HEADER_BYTES = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, HEAD\r\n'
+    b'Access-Control-Allow-Headers: Range\r\n'
+)
+_SSE_HEADER_BYTES = (
+    b'Content-Type: text/event-stream\r\n'
+    b'Cache-Control: no-cache\r\n'
+    b'Connection: keep-alive\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Headers: Cache-Control\r\n'
+)
+_GZIP_HEADER_BYTES = b'Content-Encoding: gzip\r\nVary: Accept-Encoding\r\n'
 
 # Setup logging
 logging.basicConfig(
@@ -28,22 +156,83 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.py')
+WEB_MANAGER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web_manager.html')
+
+def page_variants(content):
+    """Build the (body, gzip body, ETag) triple served for a static HTML page"""
+    return content, zlib.compress(content, 9, 31), '"' + hashlib.sha1(content).hexdigest() + '"'
+
+def parse_card_assets(source):
+    """Read the CARD_ASSETS literal from config.py source without executing the module"""
+    card_assets = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == 'CARD_ASSETS' for target in targets):
+            card_assets = ast.literal_eval(node.value)
+    return card_assets
+
+# Current time as [ISO string, HTTP Date bytes], rewritten by AssetServer's clock
+# ticker and read without a lock
+_now_cache = [datetime.now().isoformat(), email.utils.formatdate(usegmt=True).encode('ascii')]
+
+def now_iso():
+    """Current local time as an ISO string, at most half a second old"""
+    return _now_cache[0]
+
+def http_date():
+    """Current time as an HTTP Date header value, at most half a second old"""
+    return _now_cache[1]
+
+def refresh_time_strings():
+    """Reformat the cached now_iso() and http_date() values"""
+    _now_cache[:] = [datetime.now().isoformat(), email.utils.formatdate(usegmt=True).encode('ascii')]
+
+@functools.lru_cache(maxsize=512)
+def resolve_asset_path(folder, filename):
+    """Join a bare filename onto the assets folder, or return None if it names anything else"""
+    # Only plain names are valid, so '../x', 'sub/x' and absolute paths cannot escape the folder
+    if filename in ('', '.', '..') or os.path.basename(filename) != filename:
+        return None
+    return os.path.join(folder, filename)
+
+def iso_from_ts(ts):
+    """Format a time.time() value as a local ISO string"""
+    return datetime.fromtimestamp(ts).isoformat()
+
 class AssetServer:
     # Supported file extensions
     VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.m4v', '.webm')
     IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg')
     ALL_EXTENSIONS = VIDEO_EXTENSIONS + IMAGE_EXTENSIONS
+    EXT_TO_TYPE = ({ext: 'video' for ext in VIDEO_EXTENSIONS} |
+                   {ext: 'image' for ext in IMAGE_EXTENSIONS})
     
     def __init__(self):
         self.host = "0.0.0.0"
         self.port = 8080
+        self.local_ip = "localhost"  # set once by main(), never probed per request
         self.assets_folder = "./assets/"
         self.assets_played = 0
         self.last_asset_info = None
         
-        # RFID card tracking
-        self.scanned_cards = {}
-        self.unknown_cards = {}
+        # RFID card tracking, one parallel-array slot per card; formatted only on request
+        self._cards_lock = threading.Lock()
+        self._card_idx = {}  # card_id -> slot
+        self._card_ids = []
+        self._card_first = array.array('d')
+        self._card_last = array.array('d')
+        self._card_count = array.array('I')
+        self._card_mapped = bytearray()
+        # Unknown-card stats; a zero count means the card is not currently unknown
+        self._unknown_first = array.array('d')
+        self._unknown_last = array.array('d')
+        self._unknown_count = array.array('I')
         
         # Multi-asset support per card
         self.card_asset_indices = {}
@@ -51,145 +240,258 @@ class AssetServer:
         self.current_card_id = None
         self.card_removal_timestamp = None
         
+        # CARD_ASSETS from config.py, re-read only when the file changes
+        self._config_lock = threading.Lock()
+        self._config_mtime = None
+        self._cached_card_assets = {}
+        self._card_asset_entries = {}  # card_id -> (filenames, asset types), rebuilt on reload
+        
+        # Cached list_assets() result, keyed on the assets folder mtime
+        self._assets_cache = (None, [])
+        
         # SSE support for real-time updates
-        self.sse_clients = set()
+        # Copy-on-write tuple: replaced under sse_lock, read without it
+        self._sse_clients = ()
         self.sse_lock = threading.Lock()
-        self.client_cleanup_timer = None
+        self._cleanup_stop = threading.Event()
+        # Writes to SSE clients run in parallel so one slow socket can't stall the rest.
+        # Broadcasts are handed to a single dispatcher thread, so request handlers never
+        # wait on them and each client still gets events in order.
+        self._broadcast_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='sse-broadcast')
+        self._broadcast_dispatch = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sse-dispatch')
+        
+        # now_iso() and the /ping response (polled for liveness) are prebuilt by a ticker
+        self._ping_payload = b''
+        self._refresh_ping_payload()
+        threading.Thread(target=self._clock_ticker, daemon=True).start()
+        
+        # The player page only changes on redeploy, so it is loaded and hashed once
+        self.web_player_bytes = None
+        self.web_player_gzip = None
+        self.web_player_etag = None
+        self.load_web_player()
+        
+        # Management page and /config body, re-read only when their files change
+        self._web_manager_cache = (None, None)
+        self._config_response = (None, b'')
         
         os.makedirs(self.assets_folder, exist_ok=True)
         logger.info(f"Asset server initialized. Assets folder: {os.path.abspath(self.assets_folder)}")
         
+        # Build the asset listing up front; with inotify it is kept current by events
+        self._assets_watched = self.start_assets_watcher()
+        self.list_assets()
+        
+        # Likewise the card mappings, so the first scan does not pay for parsing config.py
+        try:
+            self.load_card_assets()
+        except Exception as e:
+            logger.error(f"Error loading CARD_ASSETS: {e}")
+        
         self.start_client_cleanup()
     
+    def load_web_player(self):
+        """Read web_player.html into memory along with its gzip body and ETag"""
+        web_player_path = os.path.join(os.path.dirname(__file__), 'web_player.html')
+        try:
+            with open(web_player_path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            logger.error(f"Error loading web player: {e}")
+            return
+        
+        self.web_player_bytes, self.web_player_gzip, self.web_player_etag = page_variants(content)
+    
+    def get_web_manager(self):
+        """Get web_manager.html as (body, gzip body, ETag), re-reading it only after it changes"""
+        mtime = os.stat(WEB_MANAGER_PATH).st_mtime_ns
+        cached_mtime, page = self._web_manager_cache
+        if mtime != cached_mtime:
+            with open(WEB_MANAGER_PATH, 'rb') as f:
+                page = page_variants(f.read())
+            self._web_manager_cache = (mtime, page)
+        return page
+    
+    def get_config_response(self):
+        """Get the /config JSON body, rebuilt only when config.py changes"""
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+        cached_mtime, body = self._config_response
+        if mtime != cached_mtime:
+            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+                config_content = f.read()
+            
+            # The raw text is still returned when CARD_ASSETS is broken, so it can be fixed
+            try:
+                card_assets = self.load_card_assets()
+            except Exception as e:
+                logger.error(f"Error parsing CARD_ASSETS: {e}")
+                card_assets = {}
+            
+            body = json_dumps({"config": config_content, "card_assets": card_assets})
+            self._config_response = (mtime, body)
+        return body
+    
+    def invalidate_config_cache(self):
+        """Force config.py to be re-read, for writes that may land within one mtime tick"""
+        with self._config_lock:
+            self._config_mtime = None
+        self._config_response = (None, b'')
+    
+    def _refresh_ping_payload(self):
+        """Rebuild the cached /ping response body"""
+        payload = {"status": "ok", "timestamp": now_iso()}
+        self._ping_payload = json_dumps(payload)
+    
+    def _clock_ticker(self):
+        """Keep now_iso() and the /ping response timestamp current"""
+        while True:
+            time.sleep(0.5)
+            refresh_time_strings()
+            self._refresh_ping_payload()
+    
     def start_client_cleanup(self):
         """Start periodic cleanup of stale SSE connections"""
         def cleanup_stale_clients():
-            self.cleanup_stale_connections()
-            self.client_cleanup_timer = threading.Timer(30.0, cleanup_stale_clients)
-            self.client_cleanup_timer.daemon = True
-            self.client_cleanup_timer.start()
+            while not self._cleanup_stop.wait(30.0):
+                self.cleanup_stale_connections()
         
-        self.client_cleanup_timer = threading.Timer(30.0, cleanup_stale_clients)
-        self.client_cleanup_timer.daemon = True
-        self.client_cleanup_timer.start()
+        threading.Thread(target=cleanup_stale_clients, name='sse-cleanup', daemon=True).start()
+    
+    def shutdown(self):
+        """Stop background work"""
+        self._cleanup_stop.set()
+        self._broadcast_dispatch.shutdown(wait=False)
+        self._broadcast_pool.shutdown(wait=False)
     
     def cleanup_stale_connections(self):
         """Remove stale SSE connections"""
         stale_clients = []
         
-        with self.sse_lock:
-            for client in self.sse_clients.copy():
-                try:
-                    if not hasattr(client, 'sse_connected') or not client.sse_connected:
-                        stale_clients.append(client)
-                    elif hasattr(client, 'wfile'):
-                        client.wfile.flush()
-                except (AttributeError, ConnectionResetError, BrokenPipeError, socket.error, OSError):
+        # Probe a snapshot without holding sse_lock, since a flush can block
+        for client in self._sse_clients:
+            try:
+                if not getattr(client, 'sse_connected', False):
                     stale_clients.append(client)
+                elif hasattr(client, 'wfile'):
+                    client.wfile.flush()
+            except (AttributeError, ConnectionResetError, BrokenPipeError, socket.error, OSError):
+                stale_clients.append(client)
         
         if stale_clients:
-            with self.sse_lock:
-                for client in stale_clients:
-                    self.sse_clients.discard(client)
-                    if hasattr(client, 'sse_connected'):
-                        client.sse_connected = False
+            self.drop_sse_clients(stale_clients)
     
     def add_sse_client(self, client_handler):
         """Add a new SSE client connection"""
         client_ip = getattr(client_handler, 'client_address', ['unknown'])[0]
         
         with self.sse_lock:
-            # Remove inactive connections from same client
-            existing_clients = []
-            for existing_client in list(self.sse_clients):
-                existing_ip = getattr(existing_client, 'client_address', ['unknown'])[0]
-                if (existing_ip == client_ip and 
-                    hasattr(existing_client, 'sse_connected') and 
-                    not existing_client.sse_connected):
-                    existing_clients.append(existing_client)
-            
-            for old_client in existing_clients:
-                self.sse_clients.discard(old_client)
-            
-            self.sse_clients.add(client_handler)
-            logger.info(f"SSE client connected from {client_ip}. Total clients: {len(self.sse_clients)}")
+            # Drop inactive connections from same client
+            clients = tuple(
+                existing_client for existing_client in self._sse_clients
+                if not (getattr(existing_client, 'client_address', ['unknown'])[0] == client_ip and
+                        not getattr(existing_client, 'sse_connected', False))
+            )
+            self._sse_clients = clients + (client_handler,)
+            total_clients = len(self._sse_clients)
+        
+        logger.info(f"SSE client connected from {client_ip}. Total clients: {total_clients}")
     
     def remove_sse_client(self, client_handler):
         """Remove an SSE client connection"""
         with self.sse_lock:
-            if client_handler in self.sse_clients:
-                self.sse_clients.discard(client_handler)
+            self._sse_clients = tuple(c for c in self._sse_clients if c is not client_handler)
+    
+    def drop_sse_clients(self, clients):
+        """Remove failed SSE clients and mark them disconnected"""
+        with self.sse_lock:
+            self._sse_clients = tuple(c for c in self._sse_clients if c not in clients)
+        
+        for client in clients:
+            client.sse_connected = False
     
     def broadcast_sse_event(self, event_type, data):
         """Broadcast an event to all connected SSE clients"""
-        if not self.sse_clients:
+        # Tuple snapshot; no lock needed to read it
+        clients_to_notify = self._sse_clients
+        if not clients_to_notify:
             return
             
         event_data = {
             'type': event_type,
             'data': data,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
-        json_data = json.dumps(event_data)
-        sse_message = f"event: {event_type}\ndata: {json_data}\n\n"
-        
-        # Get clients to broadcast to
-        clients_to_notify = []
-        with self.sse_lock:
-            clients_to_notify = list(self.sse_clients)
-        
-        if not clients_to_notify:
-            return
-            
-        # Send to all clients
-        failed_clients = []
-        successful_broadcasts = 0
+        payload = sse_frame(event_type, event_data)
+        self._broadcast_dispatch.submit(self._fan_out_sse, clients_to_notify, payload)
+    
+    def _fan_out_sse(self, clients, payload):
+        """Send one SSE frame to every client concurrently (runs on the dispatcher)"""
+        futures = {
+            self._broadcast_pool.submit(client.send_sse_message, payload): client
+            for client in clients
+        }
+        done, not_done = wait(futures, timeout=SSE_BROADCAST_TIMEOUT)
         
-        for client in clients_to_notify:
-            try:
-                client.send_sse_message(sse_message)
-                successful_broadcasts += 1
-            except Exception:
-                failed_clients.append(client)
+        # Sends still queued behind stalled peers never started, so they say nothing
+        # about their client; cancel them rather than deliver a stale frame later.
+        # A send already running is bounded by the socket's send timeout and drops
+        # its own client if that expires.
+        for future in not_done:
+            future.cancel()
         
-        # Clean up failed clients
+        failed_clients = [futures[future] for future in done if future.exception() is not None]
         if failed_clients:
-            with self.sse_lock:
-                for client in failed_clients:
-                    self.sse_clients.discard(client)
-                    if hasattr(client, 'sse_connected'):
-                        client.sse_connected = False
+            self.drop_sse_clients(failed_clients)
     
     def get_asset_path(self, filename):
-        """Get full path to asset file"""
-        return os.path.join(self.assets_folder, filename)
+        """Get full path to asset file, or None if filename is not a plain file name"""
+        if not isinstance(filename, str):
+            return None
+        return resolve_asset_path(self.assets_folder, filename)
     
-    def get_card_assets(self, card_id):
-        """Get all assets for a specific card"""
-        try:
-            from importlib import reload
-            import config
-            reload(config)
-            
-            card_assets = getattr(config, 'CARD_ASSETS', {})
-            assets = card_assets.get(card_id, [])
-            
+    def load_card_assets(self):
+        """Get the CARD_ASSETS mapping, re-reading config.py only when it has changed"""
+        with self._config_lock:
+            mtime = os.stat(CONFIG_PATH).st_mtime_ns
+            if mtime != self._config_mtime:
+                with open(CONFIG_PATH, 'rb') as f:
+                    card_assets = parse_card_assets(f.read())
+                self._card_asset_entries = self.build_card_asset_entries(card_assets)
+                self._cached_card_assets = card_assets
+                self._config_mtime = mtime
+            return self._cached_card_assets
+    
+    def build_card_asset_entries(self, card_assets):
+        """Flatten CARD_ASSETS into card_id -> (filenames, asset types) tuples"""
+        entries = {}
+        for card_id, assets in card_assets.items():
             # Handle both old format (string) and new format (list)
             if isinstance(assets, str):
-                return [assets]
+                files = (assets,)
             elif isinstance(assets, list):
-                return assets
+                files = tuple(assets)
             else:
-                return []
-                
+                continue
+            entries[card_id] = (files, tuple(self.get_asset_type(f) for f in files))
+        return entries
+    
+    def get_card_asset_entry(self, card_id):
+        """Get (filenames, asset types) for a specific card"""
+        try:
+            self.load_card_assets()
         except Exception as e:
             logger.error(f"Error getting card assets: {e}")
-            return []
+            return (), ()
+        return self._card_asset_entries.get(card_id, ((), ()))
+    
+    def get_card_assets(self, card_id):
+        """Get all assets for a specific card"""
+        return self.get_card_asset_entry(card_id)[0]
     
     def play_card_asset(self, card_id, asset_index=None):
         """Play asset for a card, optionally specifying index"""
-        assets = self.get_card_assets(card_id)
+        assets, asset_types = self.get_card_asset_entry(card_id)
         
         if not assets:
             logger.error(f"No assets found for card: {card_id}")
@@ -213,7 +515,8 @@ class AssetServer:
         # Set current card
         self.current_card_id = card_id
         
-        success = self.play_asset(filename, card_id, current_index, len(assets))
+        success = self.play_asset(filename, card_id, current_index, len(assets),
+                                  asset_type=asset_types[current_index])
         
         # Broadcast real-time update via SSE
         if success:
@@ -223,7 +526,7 @@ class AssetServer:
     
     def navigate_card_assets(self, card_id, direction):
         """Navigate through assets of a specific card"""
-        assets = self.get_card_assets(card_id)
+        assets, asset_types = self.get_card_asset_entry(card_id)
         
         if not assets or len(assets) <= 1:
             return False
@@ -245,7 +548,8 @@ class AssetServer:
         
         logger.info(f"Navigating card {card_id} assets: {direction} to index {new_index} ({filename})")
         
-        success = self.play_asset(filename, card_id, new_index, len(assets))
+        success = self.play_asset(filename, card_id, new_index, len(assets),
+                                  asset_type=asset_types[new_index])
         
         # Broadcast navigation update via SSE
         if success:
@@ -256,6 +560,7 @@ class AssetServer:
     def remove_card(self, card_id):
         """Handle card removal - reset to splash screen"""
         self.current_card_id = None
+        # Exact timestamp: the web player uses it to tell events apart
         self.card_removal_timestamp = datetime.now().isoformat()
         self.last_asset_info = {
             'action': 'card_removed',
@@ -270,15 +575,16 @@ class AssetServer:
         
         return True
 
-    def play_asset(self, filename, card_id="", asset_index=0, total_assets=1, asset_files=None):
+    def play_asset(self, filename, card_id="", asset_index=0, total_assets=1, asset_files=None, asset_type=None):
         """Play an asset file (video or image) and notify web clients with instant transition support"""
         asset_path = self.get_asset_path(filename)
         
-        if not os.path.exists(asset_path):
+        if not asset_path or not os.path.exists(asset_path):
             logger.error(f"Asset file not found: {asset_path}")
             return False
         
-        asset_type = self.get_asset_type(filename)
+        if asset_type is None:
+            asset_type = self.get_asset_type(filename)
         
         # Enhanced asset info for instant transitions
         self.last_asset_info = {
@@ -288,7 +594,7 @@ class AssetServer:
             'asset_index': asset_index,
             'total_assets': total_assets,
             'asset_files': asset_files or [],  # Include asset files for web player navigation
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now().isoformat(),  # Exact: the web player dedupes on it
             'transition_type': 'instant'  # Indicate instant transition support
         }
         
@@ -364,145 +670,317 @@ class AssetServer:
     
     def get_asset_type(self, filename):
         """Determine if file is video or image"""
-        filename_lower = filename.lower()
-        
-        if filename_lower.endswith(self.VIDEO_EXTENSIONS):
-            return 'video'
-        elif filename_lower.endswith(self.IMAGE_EXTENSIONS):
-            return 'image'
-        else:
-            return 'unknown'
+        return self.EXT_TO_TYPE.get(os.path.splitext(filename)[1].lower(), 'unknown')
     
     def list_assets(self):
         """List all asset files in the assets folder"""
-        assets = []
+        cached_mtime_ns, cached_assets = self._assets_cache
+        if self._assets_watched and cached_mtime_ns is not None:
+            return cached_assets
         
         try:
-            for file in os.listdir(self.assets_folder):
-                if file.lower().endswith(self.ALL_EXTENSIONS):
-                    file_path = self.get_asset_path(file)
-                    file_size = os.path.getsize(file_path)
-                    asset_type = self.get_asset_type(file)
-                    
-                    assets.append({
-                        "filename": file,
-                        "type": asset_type,
-                        "size_mb": round(file_size / (1024 * 1024), 2)
-                    })
+            mtime_ns = os.stat(self.assets_folder).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Error listing assets: {e}")
+            return []
+        
+        if mtime_ns == cached_mtime_ns:
+            return cached_assets
+        
+        try:
+            assets = self.scan_assets()
         except Exception as e:
             logger.error(f"Error listing assets: {e}")
+            return []
         
+        self._assets_cache = (mtime_ns, assets)
         return assets
     
+    def scan_assets(self):
+        """Scan the assets folder for playable files"""
+        assets = []
+        
+        with os.scandir(self.assets_folder) as entries:
+            for entry in entries:
+                asset_type = self.EXT_TO_TYPE.get(os.path.splitext(entry.name)[1].lower())
+                if not asset_type or not entry.is_file():
+                    continue
+                
+                assets.append({
+                    "filename": entry.name,
+                    "type": asset_type,
+                    "size_mb": round(entry.stat().st_size / (1024 * 1024), 2)
+                })
+        
+        return assets
+    
+    def invalidate_assets_cache(self):
+        """Force the next list_assets() call to rescan the assets folder"""
+        self._assets_cache = (None, [])
+    
+    def start_assets_watcher(self):
+        """Watch the assets folder with inotify so list_assets() needs no stat, if available"""
+        if INotify is None:
+            return False
+        
+        try:
+            inotify = INotify()
+            inotify.add_watch(self.assets_folder,
+                              inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.CLOSE_WRITE |
+                              inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM)
+        except OSError as e:
+            logger.warning(f"Asset folder watch unavailable, using mtime checks: {e}")
+            return False
+        
+        def watch_assets():
+            while True:
+                # Short read delay so a burst of events (e.g. a copy of many files) is one rescan
+                try:
+                    inotify.read(read_delay=100)
+                    self.invalidate_assets_cache()
+                    self.list_assets()
+                except Exception as e:
+                    logger.error(f"Asset folder watch error: {e}")
+                    time.sleep(1)
+        
+        threading.Thread(target=watch_assets, name='assets-watcher', daemon=True).start()
+        return True
+    
     def track_card_scan(self, card_id, is_mapped=True):
         """Track RFID card scan for management purposes"""
-        current_time = datetime.now().isoformat()
-        
-        if card_id not in self.scanned_cards:
-            self.scanned_cards[card_id] = {
-                'first_seen': current_time,
-                'last_seen': current_time,
-                'scan_count': 1,
-                'mapped': is_mapped
+        current_time = time.time()
+        
+        with self._cards_lock:
+            i = self._card_idx.get(card_id)
+            if i is None:
+                i = self._card_idx[card_id] = len(self._card_ids)
+                self._card_ids.append(card_id)
+                self._card_first.append(current_time)
+                self._card_last.append(current_time)
+                self._card_count.append(1)
+                self._card_mapped.append(is_mapped)
+                self._unknown_first.append(0.0)
+                self._unknown_last.append(0.0)
+                self._unknown_count.append(0)
+            else:
+                self._card_last[i] = current_time
+                self._card_count[i] += 1
+                self._card_mapped[i] = is_mapped
+            
+            # Also track unknown cards separately
+            if not is_mapped:
+                if not self._unknown_count[i]:
+                    self._unknown_first[i] = current_time
+                self._unknown_last[i] = current_time
+                self._unknown_count[i] += 1
+    
+    def get_scanned_cards(self):
+        """Build the scanned cards report, keyed by card ID"""
+        with self._cards_lock:
+            return {
+                card_id: {
+                    'first_seen': iso_from_ts(self._card_first[i]),
+                    'last_seen': iso_from_ts(self._card_last[i]),
+                    'scan_count': self._card_count[i],
+                    'mapped': bool(self._card_mapped[i])
+                }
+                for i, card_id in enumerate(self._card_ids)
             }
-        else:
-            self.scanned_cards[card_id]['last_seen'] = current_time
-            self.scanned_cards[card_id]['scan_count'] += 1
-            self.scanned_cards[card_id]['mapped'] = is_mapped
-        
-        # Also track unknown cards separately
-        if not is_mapped:
-            if card_id not in self.unknown_cards:
-                self.unknown_cards[card_id] = {
-                    'first_seen': current_time,
-                    'last_seen': current_time,
-                    'scan_count': 1
+    
+    def get_unknown_cards(self):
+        """Build the unknown cards report, keyed by card ID"""
+        with self._cards_lock:
+            return {
+                card_id: {
+                    'first_seen': iso_from_ts(self._unknown_first[i]),
+                    'last_seen': iso_from_ts(self._unknown_last[i]),
+                    'scan_count': self._unknown_count[i]
                 }
-            else:
-                self.unknown_cards[card_id]['last_seen'] = current_time
-                self.unknown_cards[card_id]['scan_count'] += 1
+                for i, card_id in enumerate(self._card_ids)
+                if self._unknown_count[i]
+            }
 
     def update_card_mapping_status(self):
         """Update card mapping status based on current config"""
         try:
-            # Get current card mappings from config
-            from importlib import reload
-            import config
-            reload(config)  # Reload to get latest changes
-            
-            current_mappings = getattr(config, 'CARD_ASSETS', {})
+            # Get current card mappings from config (re-read if it changed)
+            current_mappings = self.load_card_assets()
             
             # Update mapping status for all tracked cards
-            for card_id in self.scanned_cards:
-                is_mapped = card_id in current_mappings
-                self.scanned_cards[card_id]['mapped'] = is_mapped
-                
-                # Remove from unknown_cards if now mapped
-                if is_mapped and card_id in self.unknown_cards:
-                    del self.unknown_cards[card_id]
+            with self._cards_lock:
+                for i, card_id in enumerate(self._card_ids):
+                    is_mapped = card_id in current_mappings
+                    self._card_mapped[i] = is_mapped
+                    
+                    # Remove from unknown cards if now mapped
+                    if is_mapped:
+                        self._unknown_count[i] = 0
                     
             logger.info(f"Updated card mapping status. {len(current_mappings)} cards mapped.")
             
             # Broadcast config update via SSE
             self.broadcast_sse_event('config_updated', {
                 'mapped_cards': len(current_mappings),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
             
         except Exception as e:
             logger.error(f"Error updating card mapping status: {e}")
 
 class RequestHandler(BaseHTTPRequestHandler):
-    def __init__(self, *args, asset_server=None, **kwargs):
-        self.asset_server = asset_server
-        self.sse_connected = False
-        super().__init__(*args, **kwargs)
+    # Bound to the running AssetServer by create_handler()
+    asset_server = None
+    sse_connected = False
+    sse_compressor = None
+    _body_buf = None  # request body buffer, reused across requests on a keep-alive connection
+    
+    # Keep-alive, so kiosks and the player reuse one connection (and handler thread)
+    # across requests; idle connections are dropped after the timeout
+    protocol_version = 'HTTP/1.1'
+    timeout = 120
+    
+    def setup(self):
+        """Disable Nagle so small responses go out immediately, and detect dead peers"""
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # SSE connections sit idle between events; keepalive reaps vanished players
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
     
     def log_message(self, format, *args):
         """Override to use our logger"""
         logger.info(f"{self.address_string()} - {format % args}")
     
-    def send_sse_message(self, message):
-        """Send SSE message to client"""
+    def send_sse_message(self, payload):
+        """Send a pre-encoded SSE frame to client"""
         if not self.sse_connected:
             return
         try:
-            self.wfile.write(message.encode('utf-8'))
-            self.wfile.flush()
+            # Broadcast workers and the heartbeat loop may write concurrently
+            with self.sse_write_lock:
+                if self.sse_compressor:
+                    # Sync flush so the browser can decode each event as it arrives
+                    payload = self.sse_compressor.compress(payload) + self.sse_compressor.flush(zlib.Z_SYNC_FLUSH)
+                self.connection.sendall(payload)
         except (ConnectionResetError, BrokenPipeError, socket.error, OSError):
             self.sse_connected = False
             self.asset_server.remove_sse_client(self)
             raise
     
+    def end_headers(self, body=b''):
+        """Finish the header block and send it, with body (if given) in the same write"""
+        # HTTP/1.0 clients only keep the connection open if the response confirms it
+        if self.request_version == 'HTTP/1.0' and not self.close_connection:
+            self.send_header('Connection', 'keep-alive')
+        
+        if self.request_version != 'HTTP/0.9':
+            self._headers_buffer.append(b'\r\n')
+            if body:
+                self._headers_buffer.append(body)
+                body = b''
+            self.flush_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def send_static_headers(self, header_bytes):
+        """Queue pre-encoded header lines, bypassing send_header formatting"""
+        if self.request_version != 'HTTP/0.9':
+            self._headers_buffer.append(header_bytes)
+    
+    def accepts_gzip(self):
+        """Check whether the client accepts gzip-encoded responses"""
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+    
     def send_safe_response(self, response_code, content_type="text/plain", content=""):
         """Safely send response, handling broken connections"""
         try:
             if isinstance(content, str):
                 content = content.encode('utf-8')
             
+            compress = (len(content) > COMPRESS_MIN_BYTES
+                        and content_type.startswith(_COMPRESSIBLE_TYPES)
+                        and self.accepts_gzip())
+            if compress:
+                content = zlib.compress(content, 1, 31)
+            
             self.send_response(response_code)
             self.send_header('Content-Type', content_type)
             self.send_header('Content-Length', str(len(content)))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            if content:
-                self.wfile.write(content)
+            if compress:
+                self.send_static_headers(_GZIP_HEADER_BYTES)
+            self.send_static_headers(_CORS_HEADER_BYTES)
+            # One write for headers and body, so they leave in a single segment
+            self.end_headers(content)
                 
         except (ConnectionResetError, BrokenPipeError, socket.error):
             logger.debug(f"Client disconnected during response")
         except Exception as e:
             logger.error(f"Error sending response: {e}")
     
+    def _send_json_ok(self, body):
+        """Send a 200 JSON body behind a pre-encoded header block, in one write"""
+        # Bodies that would be gzipped, and pre-1.1 clients, take the general path
+        if (self.request_version != 'HTTP/1.1'
+                or (len(body) > COMPRESS_MIN_BYTES and self.accepts_gzip())):
+            self.send_safe_response(200, 'application/json', body)
+            return
+        
+        try:
+            self.log_request(200)
+            self.wfile.write(b'%sDate: %s\r\nContent-Length: %d\r\n\r\n%s'
+                             % (_JSON_OK_HEAD, http_date(), len(body), body))
+        except (ConnectionResetError, BrokenPipeError, socket.error):
+            logger.debug("Client disconnected during response")
+    
     def send_json_response(self, data):
         """Send JSON response safely"""
         try:
-            response_data = json.dumps(data)
-            self.send_safe_response(200, 'application/json', response_data)
+            response_data = json_dumps(data)
+            self._send_json_ok(response_data)
         except Exception as e:
             logger.error(f"Error sending JSON response: {e}")
             self.send_safe_response(500, 'text/plain', 'Internal server error')
     
+    def _read_json_body(self, loads=json_loads):
+        """Read and parse a JSON object request body, raising RequestError if invalid"""
+        try:
+            content_length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            content_length = -1
+        
+        if content_length < 0:
+            # Without a length the body cannot be skipped, so the connection cannot be reused
+            self.close_connection = True
+            raise RequestError(400, 'Missing or invalid Content-Length')
+        
+        if content_length > MAX_POST_BYTES:
+            # The body is left unread, so this connection cannot be reused
+            self.close_connection = True
+            raise RequestError(413, 'Request body too large')
+        
+        buf = self._body_buf
+        if buf is None or len(buf) < content_length:
+            buf = self._body_buf = bytearray(max(content_length, 4096))
+        
+        with memoryview(buf)[:content_length] as body:
+            if self.rfile.readinto(body) != content_length:
+                self.close_connection = True
+                raise RequestError(400, 'Incomplete request body')
+            try:
+                data = loads(body)
+            except ValueError:
+                data = None
+        
+        if not isinstance(data, dict):
+            raise RequestError(400, 'Invalid JSON')
+        
+        return data
+    
+    @staticmethod
+    def _card_id(data, default=None):
+        """Get card_id from a request body, interned since it keys the per-card dicts"""
+        card_id = data.get('card_id', default)
+        return sys.intern(card_id) if isinstance(card_id, str) else card_id
+    
     def handle_client_disconnect(self, operation="request"):
         """Handle client disconnection gracefully"""
         logger.debug(f"Client disconnected during {operation}")
@@ -510,61 +988,37 @@ class RequestHandler(BaseHTTPRequestHandler):
     def handle_server_error(self, error, operation="operation"):
         """Handle server errors consistently"""
         logger.error(f"Error during {operation}: {error}")
+        self.close_connection = True
         try:
             self.send_safe_response(500, 'text/plain', 'Internal server error')
         except:
             pass
     
+    # Exact-match GET routes; '/assets/<name>' is handled as a prefix in do_GET
+    _GET_ROUTES = {
+        '/': 'serve_web_player',
+        '/manage': 'serve_management_interface',
+        '/events': 'handle_sse_connection',
+        '/config': 'get_config',
+        '/ping': '_ping',
+        '/status': '_status',
+        '/assets': '_list_assets',
+        '/current-asset': '_current_asset',
+        '/scanned-cards': '_scanned_cards',
+        '/unknown-cards': '_unknown_cards',
+    }
+    
     def do_GET(self):
         """Handle GET requests"""
         try:
-            if self.path == '/':
-                self.serve_web_player()
-            elif self.path == '/manage':
-                self.serve_management_interface()
-            elif self.path == '/events':
-                self.handle_sse_connection()
-            elif self.path == '/config':
-                self.get_config()
-            elif self.path == '/ping':
-                self.send_json_response({"status": "ok", "timestamp": datetime.now().isoformat()})
-            elif self.path == '/status':
-                response = {
-                    "status": "running",
-                    "assets_played": self.asset_server.assets_played,
-                    "assets_folder": os.path.abspath(self.asset_server.assets_folder),
-                    "last_asset": self.asset_server.last_asset_info,
-                    "timestamp": datetime.now().isoformat()
-                }
-                self.send_json_response(response)
-            elif self.path == '/assets':
-                assets = self.asset_server.list_assets()
-                self.send_json_response({"assets": assets, "count": len(assets)})
+            handler = self._GET_ROUTES.get(self.path)
+            if handler:
+                getattr(self, handler)()
             elif self.path.startswith('/assets/'):
                 asset_filename = self.path[8:]  # Remove '/assets/'
                 # URL decode the filename to handle spaces and special characters
                 asset_filename = urllib.parse.unquote(asset_filename)
                 self.serve_asset_file(asset_filename)
-            elif self.path == '/current-asset':
-                if self.asset_server.last_asset_info:
-                    self.send_json_response(self.asset_server.last_asset_info)
-                else:
-                    self.send_json_response({"asset_file": None})
-            elif self.path == '/scanned-cards':
-                # Return all scanned cards (both mapped and unknown)
-                response = {
-                    "scanned_cards": self.asset_server.scanned_cards,
-                    "unknown_cards": self.asset_server.unknown_cards,
-                    "total_scanned": len(self.asset_server.scanned_cards),
-                    "total_unknown": len(self.asset_server.unknown_cards)
-                }
-                self.send_json_response(response)
-            elif self.path == '/unknown-cards':
-                # Return only unknown cards
-                self.send_json_response({
-                    "unknown_cards": self.asset_server.unknown_cards,
-                    "count": len(self.asset_server.unknown_cards)
-                })
             else:
                 self.send_safe_response(404, 'text/plain', 'Not Found')
                 
@@ -573,19 +1027,73 @@ class RequestHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self.handle_server_error(e)
     
+    def _ping(self):
+        """Liveness probe"""
+        self._send_json_ok(self.asset_server._ping_payload)
+    
+    def _status(self):
+        """Report server status"""
+        response = {
+            "status": "running",
+            "assets_played": self.asset_server.assets_played,
+            "assets_folder": os.path.abspath(self.asset_server.assets_folder),
+            "last_asset": self.asset_server.last_asset_info,
+            "timestamp": now_iso()
+        }
+        self.send_json_response(response)
+    
+    def _list_assets(self):
+        """List available asset files"""
+        assets = self.asset_server.list_assets()
+        self.send_json_response({"assets": assets, "count": len(assets)})
+    
+    def _current_asset(self):
+        """Report the most recently triggered asset"""
+        if self.asset_server.last_asset_info:
+            self.send_json_response(self.asset_server.last_asset_info)
+        else:
+            self.send_json_response({"asset_file": None})
+    
+    def _scanned_cards(self):
+        """Return all scanned cards (both mapped and unknown)"""
+        scanned_cards = self.asset_server.get_scanned_cards()
+        unknown_cards = self.asset_server.get_unknown_cards()
+        response = {
+            "scanned_cards": scanned_cards,
+            "unknown_cards": unknown_cards,
+            "total_scanned": len(scanned_cards),
+            "total_unknown": len(unknown_cards)
+        }
+        self.send_json_response(response)
+    
+    def _unknown_cards(self):
+        """Return only unknown cards"""
+        unknown_cards = self.asset_server.get_unknown_cards()
+        self.send_json_response({
+            "unknown_cards": unknown_cards,
+            "count": len(unknown_cards)
+        })
+    
     def handle_sse_connection(self):
         """Handle Server-Sent Events connection"""
+        # The stream has no length; it ends when either side closes the connection
+        self.close_connection = True
         try:
             # Send SSE headers
             self.send_response(200)
-            self.send_header('Content-Type', 'text/event-stream')
-            self.send_header('Cache-Control', 'no-cache')
-            self.send_header('Connection', 'keep-alive')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Headers', 'Cache-Control')
+            self.send_static_headers(_SSE_HEADER_BYTES)
+            if self.accepts_gzip():
+                self.sse_compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+                self.send_static_headers(_GZIP_HEADER_BYTES)
+                self.send_header('X-Accel-Buffering', 'no')
             self.end_headers()
             
+            # Broadcast workers write to this socket; a peer that stops reading
+            # must not hold one for the whole handler timeout
+            self.connection.settimeout(SSE_BROADCAST_TIMEOUT)
+            
             # Mark as SSE connected and add to server's client list
+            self.sse_write_lock = threading.Lock()
             self.sse_connected = True
             self.connection_id = f"{self.client_address[0]}:{self.client_address[1]}:{int(time.time())}"
             self.asset_server.add_sse_client(self)
@@ -594,42 +1102,34 @@ class RequestHandler(BaseHTTPRequestHandler):
             initial_data = {
                 'status': 'connected',
                 'connection_id': self.connection_id,
-                'server_time': datetime.now().isoformat(),
+                'server_time': now_iso(),
                 'assets_played': self.asset_server.assets_played,
                 'last_asset': self.asset_server.last_asset_info
             }
-            self.send_sse_message(f"event: connection\ndata: {json.dumps(initial_data)}\n\n")
+            self.send_sse_message(sse_frame('connection', initial_data))
             
-            # Keep connection alive with periodic heartbeat
+            # Keep connection alive with a periodic status update + heartbeat,
+            # sent together as one frame in a single write
             try:
-                heartbeat_count = 0
                 while self.sse_connected:
-                    time.sleep(15)
-                    heartbeat_count += 1
+                    time.sleep(SSE_KEEPALIVE_INTERVAL)
                     
-                    # Send heartbeat every 4th check (60 seconds)
-                    if heartbeat_count % 4 == 0:
-                        try:
-                            heartbeat_data = {
-                                'type': 'heartbeat',
-                                'timestamp': datetime.now().isoformat()
-                            }
-                            self.send_sse_message(f"event: heartbeat\ndata: {json.dumps(heartbeat_data)}\n\n")
-                        except Exception:
-                            break
-                    
-                    # Send status update every 2nd check (30 seconds)
-                    elif heartbeat_count % 2 == 0:
-                        try:
-                            status_data = {
-                                'type': 'status_update',
-                                'assets_played': self.asset_server.assets_played,
-                                'timestamp': datetime.now().isoformat(),
-                                'last_asset': self.asset_server.last_asset_info
-                            }
-                            self.send_sse_message(f"event: status_update\ndata: {json.dumps(status_data)}\n\n")
-                        except Exception:
-                            break
+                    timestamp = now_iso()
+                    status_data = {
+                        'type': 'status_update',
+                        'assets_played': self.asset_server.assets_played,
+                        'timestamp': timestamp,
+                        'last_asset': self.asset_server.last_asset_info
+                    }
+                    heartbeat_data = {
+                        'type': 'heartbeat',
+                        'timestamp': timestamp
+                    }
+                    frame = sse_frame('status_update', status_data) + sse_frame('heartbeat', heartbeat_data)
+                    try:
+                        self.send_sse_message(frame)
+                    except Exception:
+                        break
                             
             except (ConnectionResetError, BrokenPipeError, socket.error):
                 pass
@@ -642,60 +1142,97 @@ class RequestHandler(BaseHTTPRequestHandler):
         except Exception as e:
             logger.error(f"Error setting up SSE connection: {e}")
             self.sse_connected = False
-            if self in self.asset_server.sse_clients:
-                self.asset_server.remove_sse_client(self)
+            self.asset_server.remove_sse_client(self)
     
 
     
     def serve_web_player(self):
         """Serve the web player HTML file"""
+        if self.asset_server.web_player_bytes is None:
+            self.send_safe_response(404, 'text/plain', 'Web player not found')
+            return
+        
+        self.send_cached_page(self.asset_server.web_player_bytes,
+                              self.asset_server.web_player_gzip,
+                              self.asset_server.web_player_etag)
+    
+    def send_cached_page(self, content, gzip_content, etag):
+        """Send an in-memory HTML page, honouring If-None-Match and gzip"""
+        if self.accepts_gzip():
+            # Each encoding is a distinct representation, so it gets its own ETag
+            content = gzip_content
+            etag = etag[:-1] + '-gz"'
+        else:
+            gzip_content = None
+        
         try:
-            web_player_path = os.path.join(os.path.dirname(__file__), 'web_player.html')
-            with open(web_player_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.send_safe_response(200, 'text/html; charset=utf-8', content)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
             
-        except FileNotFoundError:
-            self.send_safe_response(404, 'text/plain', 'Web player not found')
-        except Exception as e:
-            logger.error(f"Error serving web player: {e}")
-            self.send_safe_response(500, 'text/plain', str(e))
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('ETag', etag)
+            if gzip_content:
+                self.send_static_headers(_GZIP_HEADER_BYTES)
+            self.send_static_headers(_CORS_HEADER_BYTES)
+            self.end_headers(content)
+        except (ConnectionResetError, BrokenPipeError, socket.error):
+            logger.debug("Client disconnected during response")
     
     def serve_asset_file(self, filename):
         """Serve asset files for web player"""
         try:
             asset_path = self.asset_server.get_asset_path(filename)
-            
-            if not os.path.exists(asset_path):
+            if not asset_path:
                 self.send_safe_response(404, 'text/plain', 'Asset not found')
                 return
             
-            file_size = os.path.getsize(asset_path)
-            mime_type, _ = mimetypes.guess_type(asset_path)
-            
-            if not mime_type:
-                if filename.lower().endswith(('.mp4', '.mov')):
-                    mime_type = 'video/mp4'
-                elif filename.lower().endswith(('.jpg', '.jpeg')):
-                    mime_type = 'image/jpeg'
-                elif filename.lower().endswith('.png'):
-                    mime_type = 'image/png'
-                else:
-                    mime_type = 'application/octet-stream'
+            # Opened once and fstat'ed, so the size always matches the file being sent
+            try:
+                f = open(asset_path, 'rb')
+            except (FileNotFoundError, IsADirectoryError):
+                self.send_safe_response(404, 'text/plain', 'Asset not found')
+                return
             
-            # Handle range requests for video streaming
-            range_header = self.headers.get('Range')
-            if range_header and mime_type.startswith('video/'):
-                self.handle_range_request(asset_path, file_size, mime_type, range_header)
-            else:
-                self.serve_full_file(asset_path, file_size, mime_type, filename)
+            with f:
+                self.send_asset(f, filename, asset_path)
                     
         except Exception as e:
             logger.error(f"Error serving asset {filename}: {e}")
+            # Headers may already be out, so the response cannot be trusted to be framed
+            self.close_connection = True
             self.send_safe_response(500, 'text/plain', 'Error serving asset')
     
-    def serve_full_file(self, asset_path, file_size, mime_type, filename):
+    def send_asset(self, f, filename, asset_path):
+        """Send an open asset file, as a whole or as the requested byte range"""
+        file_size = os.fstat(f.fileno()).st_size
+        mime_type, _ = mimetypes.guess_type(asset_path)
+        
+        if not mime_type:
+            if filename.lower().endswith(('.mp4', '.mov')):
+                mime_type = 'video/mp4'
+            elif filename.lower().endswith(('.jpg', '.jpeg')):
+                mime_type = 'image/jpeg'
+            elif filename.lower().endswith('.png'):
+                mime_type = 'image/png'
+            else:
+                mime_type = 'application/octet-stream'
+        
+        if mime_type.startswith('video/'):
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, VIDEO_SNDBUF_BYTES)
+        
+        # Handle range requests for video streaming
+        range_header = self.headers.get('Range')
+        if range_header and mime_type.startswith('video/'):
+            self.handle_range_request(f, file_size, mime_type, range_header)
+        else:
+            self.serve_full_file(f, file_size, mime_type, filename)
+    
+    def serve_full_file(self, f, file_size, mime_type, filename):
         """Serve entire file with optimized headers for instant transitions"""
         try:
             self.send_response(200)
@@ -706,31 +1243,41 @@ class RequestHandler(BaseHTTPRequestHandler):
             # Add caching headers for faster loading
             self.send_header('Cache-Control', 'public, max-age=3600, immutable')  # Cache for 1 hour, immutable
             self.send_header('ETag', f'"{hash(filename)}"')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, HEAD')
-            self.send_header('Access-Control-Allow-Headers', 'Range')
+            self.send_static_headers(_ASSET_CORS_HEADER_BYTES)
             self.end_headers()
             
-            with open(asset_path, 'rb') as f:
-                chunk_size = 8192
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
+            self.send_file_body(f, 0, file_size)
                     
         except (ConnectionResetError, BrokenPipeError, socket.error):
             logger.debug(f"Client disconnected during asset transfer: {filename}")
+            self.close_connection = True
     
-    def handle_range_request(self, asset_path, file_size, mime_type, range_header):
+    def handle_range_request(self, f, file_size, mime_type, range_header):
         """Handle HTTP range requests for video streaming"""
         try:
-            range_match = range_header.replace('bytes=', '').split('-')
-            start = int(range_match[0]) if range_match[0] else 0
-            end = int(range_match[1]) if range_match[1] else file_size - 1
+            spec = range_header[6:] if range_header.startswith('bytes=') else range_header
+            first, _, last = spec.partition('-')
+            
+            # Multi-range (multipart/byteranges) responses are not supported
+            if ',' in spec or not (first or last):
+                self.send_range_not_satisfiable(file_size)
+                return
+            
+            try:
+                if first:
+                    start = int(first)
+                    end = min(file_size - 1, int(last)) if last else file_size - 1
+                else:
+                    # Suffix range: the final N bytes
+                    start = max(0, file_size - int(last))
+                    end = file_size - 1
+            except ValueError:
+                start, end = 0, -1
+            
+            if start > end:
+                self.send_range_not_satisfiable(file_size)
+                return
             
-            start = max(0, start)
-            end = min(file_size - 1, end)
             content_length = end - start + 1
             
             self.send_response(206)  # Partial Content
@@ -740,86 +1287,90 @@ class RequestHandler(BaseHTTPRequestHandler):
             self.send_header('Accept-Ranges', 'bytes')
             self.end_headers()
             
-            with open(asset_path, 'rb') as f:
-                f.seek(start)
-                remaining = content_length
-                while remaining > 0:
-                    chunk_size = min(8192, remaining)
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
-                    remaining -= len(chunk)
+            self.send_file_body(f, start, content_length)
                     
         except (ConnectionResetError, BrokenPipeError, socket.error):
             logger.debug("Client disconnected during range request")
+            self.close_connection = True
         except Exception as e:
             logger.error(f"Error handling range request: {e}")
+            # Headers may already be out, so the response cannot be trusted to be framed
+            self.close_connection = True
+    
+    def send_file_body(self, f, offset, count):
+        """Copy count bytes of an open file, starting at offset, to the client"""
+        if count <= 0:
+            return
+        
+        if HAVE_FADVISE:
+            # Ask for aggressive readahead over the span about to be streamed
+            os.posix_fadvise(f.fileno(), offset, count, os.POSIX_FADV_SEQUENTIAL)
+        
+        if HAVE_SENDFILE:
+            # Kernel copies file pages straight to the socket, no userspace buffers
+            sent = self.connection.sendfile(f, offset, count)
+        else:
+            sent = self.copy_file_body(f, offset, count)
+        
+        if sent < count:
+            # File shrank under us; the body is short of Content-Length, so end the connection
+            self.close_connection = True
+    
+    def copy_file_body(self, f, offset, count):
+        """Copy a file span through userspace; returns the number of bytes sent"""
+        # One reusable buffer filled with readinto(), rather than a new bytes per chunk
+        buf = memoryview(bytearray(min(STREAM_CHUNK_SIZE, count)))
+        f.seek(offset)
+        remaining = count
+        while remaining > 0:
+            n = f.readinto(buf[:min(len(buf), remaining)])
+            if not n:
+                break
+            self.wfile.write(buf[:n])
+            remaining -= n
+        return count - remaining
+    
+    def send_range_not_satisfiable(self, file_size):
+        """Reject a Range header that cannot be served"""
+        self.send_response(416)
+        self.send_header('Content-Range', f'bytes */{file_size}')
+        self.send_header('Content-Length', '0')
+        self.send_static_headers(_CORS_HEADER_BYTES)
+        self.end_headers()
+    
+    # JSON POST routes: path -> (handler method, body parser); each handler gets the parsed body
+    _POST_JSON_ROUTES = {
+        '/play': ('handle_play', parse_hot_json),
+        '/navigate': ('handle_navigation', parse_hot_json),
+        '/update-config': ('handle_config_update', json_loads),
+        '/rename-file': ('handle_file_rename', json_loads),
+        '/delete-file': ('handle_file_delete', json_loads),
+        '/unknown-card': ('handle_unknown_card', json_loads),
+        '/card-removed': ('handle_card_removal', json_loads),
+    }
+    
+    # POST routes that read their own (non-JSON) bodies
+    _POST_ROUTES = {
+        '/upload': 'handle_file_upload',
+    }
     
     def do_POST(self):
         """Handle POST requests"""
         try:
-            if self.path == '/play':
+            route = self._POST_JSON_ROUTES.get(self.path)
+            if route:
+                handler, loads = route
                 try:
-                    content_length = int(self.headers['Content-Length'])
-                    post_data = self.rfile.read(content_length)
-                    
-                    data = json.loads(post_data.decode('utf-8'))
-                    card_id = data.get('card_id', '')
-                    asset_files = data.get('asset_files', [])  # List of asset filenames from client
-                    asset_index = data.get('asset_index', 0)  # Optional - to specify which asset
-                    
-                    if not asset_files:
-                        self.send_safe_response(400, 'text/plain', 'No asset_files specified')
-                        return
-                    
-                    logger.info(f"RFID Card {card_id} scanned - Assets: {asset_files}")
-                    
-                    # Play assets directly from client request
-                    success = self.asset_server.play_assets_directly(asset_files, card_id, asset_index)
-                    
-                    if success:
-                        asset_info = self.asset_server.last_asset_info
-                        response = {
-                            "success": True,
-                            "card_id": card_id,
-                            "asset_file": asset_info['asset_file'],
-                            "asset_index": asset_info['asset_index'],
-                            "total_assets": asset_info['total_assets'],
-                            "message": f"Asset triggered: {asset_info['asset_file']} ({asset_info['asset_index'] + 1}/{asset_info['total_assets']})",
-                            "timestamp": datetime.now().isoformat(),
-                            "web_player_url": f"http://{self.headers.get('Host', 'localhost')}/"
-                        }
-                    else:
-                        response = {
-                            "success": False,
-                            "card_id": card_id,
-                            "message": f"Failed to trigger assets for card {card_id}",
-                            "timestamp": datetime.now().isoformat()
-                        }
-                    
-                    self.send_json_response(response)
-                    
-                except json.JSONDecodeError:
-                    self.send_safe_response(400, 'text/plain', 'Invalid JSON')
-                except Exception as e:
-                    logger.error(f"Error handling play request: {e}")
-                    self.send_safe_response(500, 'text/plain', 'Internal server error')
-            elif self.path == '/upload':
-                self.handle_file_upload()
-            elif self.path == '/update-config':
-                self.handle_config_update()
-            elif self.path == '/rename-file':
-                self.handle_file_rename()
-            elif self.path == '/delete-file':
-                self.handle_file_delete()
-            elif self.path == '/unknown-card':
-                self.handle_unknown_card()
-            elif self.path == '/navigate':
-                self.handle_navigation()
-            elif self.path == '/card-removed':
-                self.handle_card_removal()
+                    data = self._read_json_body(loads)
+                except RequestError as e:
+                    self.send_safe_response(e.status, 'text/plain', str(e))
+                    return
+                getattr(self, handler)(data)
+            elif self.path in self._POST_ROUTES:
+                getattr(self, self._POST_ROUTES[self.path])()
             else:
+                # Any body is left unread
+                self.close_connection = True
                 self.send_safe_response(404, 'text/plain', 'Not Found')
                 
         except (ConnectionResetError, BrokenPipeError, socket.error):
@@ -827,104 +1378,227 @@ class RequestHandler(BaseHTTPRequestHandler):
         except Exception as e:
             logger.error(f"Error handling POST request: {e}")
 
-    def serve_management_interface(self):
-        """Serve the management interface HTML file"""
+    def handle_play(self, data):
+        """Handle RFID play requests carrying the card's asset files"""
         try:
-            web_manager_path = os.path.join(os.path.dirname(__file__), 'web_manager.html')
-            with open(web_manager_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            card_id = self._card_id(data, '')
+            asset_files = data.get('asset_files', [])  # List of asset filenames from client
+            asset_index = data.get('asset_index', 0)  # Optional - to specify which asset
+            
+            if not asset_files:
+                self.send_safe_response(400, 'text/plain', 'No asset_files specified')
+                return
+            
+            logger.info(f"RFID Card {card_id} scanned - Assets: {asset_files}")
+            
+            # Play assets directly from client request
+            success = self.asset_server.play_assets_directly(asset_files, card_id, asset_index)
             
-            self.send_safe_response(200, 'text/html; charset=utf-8', content)
+            if success:
+                asset_info = self.asset_server.last_asset_info
+                host = self.headers.get('Host') or f'{self.asset_server.local_ip}:{self.asset_server.port}'
+                self._send_json_ok(_PLAY_RESPONSE % (
+                    json_dumps(card_id),
+                    json_dumps(asset_info['asset_file']),
+                    json_dumps(asset_info['asset_index']),
+                    json_dumps(asset_info['total_assets']),
+                    json_dumps(f"Asset triggered: {asset_info['asset_file']} ({asset_info['asset_index'] + 1}/{asset_info['total_assets']})"),
+                    json_dumps(now_iso()),
+                    json_dumps(f"http://{host}/")
+                ))
+            else:
+                self.send_json_response({
+                    "success": False,
+                    "card_id": card_id,
+                    "message": f"Failed to trigger assets for card {card_id}",
+                    "timestamp": now_iso()
+                })
             
+        except Exception as e:
+            logger.error(f"Error handling play request: {e}")
+            self.send_safe_response(500, 'text/plain', 'Internal server error')
+
+    def serve_management_interface(self):
+        """Serve the management interface HTML file"""
+        try:
+            content, gzip_content, etag = self.asset_server.get_web_manager()
         except FileNotFoundError:
             self.send_safe_response(404, 'text/plain', 'Management interface not found')
+            return
         except Exception as e:
             logger.error(f"Error serving management interface: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
+            return
+        
+        self.send_cached_page(content, gzip_content, etag)
 
     def get_config(self):
         """Get the current config.py contents"""
         try:
-            config_path = os.path.join(os.path.dirname(__file__), 'config.py')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_content = f.read()
-            
-            response = {
-                "config": config_content,
-                "card_assets": self.get_card_assets()
-            }
-            self.send_json_response(response)
+            self.send_safe_response(200, 'application/json', self.asset_server.get_config_response())
             
         except Exception as e:
             logger.error(f"Error reading config: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def get_card_assets(self):
-        """Get the current CARD_ASSETS mapping"""
-        try:
-            from config import CARD_ASSETS
-            return CARD_ASSETS
-        except:
-            return {}
-
     def handle_file_upload(self):
         """Handle file upload requests"""
         try:
             content_type = self.headers['Content-Type']
             if not content_type.startswith('multipart/form-data'):
+                self.close_connection = True
                 self.send_safe_response(400, 'text/plain', 'Invalid content type')
                 return
 
-            # Get the boundary
-            boundary = content_type.split('=')[1].encode()
-            remainbytes = int(self.headers['Content-Length'])
-            line = self.rfile.readline()
-            remainbytes -= len(line)
-
-            if not boundary in line:
-                self.send_safe_response(400, 'text/plain', 'Invalid boundary')
+            if StreamingFormDataParser is not None:
+                filename = self.receive_upload_streaming(content_type)
+            else:
+                filename = self.receive_upload_lines(content_type)
+            if filename is None:
+                # A rejected upload may leave part of the body unread
+                self.close_connection = True
                 return
-
-            # Get filename from Content-Disposition header
-            line = self.rfile.readline()
-            remainbytes -= len(line)
-            filename = line.decode().split('filename=')[1].strip().strip('"')
-
-            # Skip headers
-            while remainbytes > 0:
-                line = self.rfile.readline()
-                remainbytes -= len(line)
-                if line == b'\r\n':
-                    break
-
-            # Write file
-            filepath = os.path.join(self.asset_server.assets_folder, filename)
-            with open(filepath, 'wb') as f:
-                while remainbytes > 0:
-                    line = self.rfile.readline()
-                    remainbytes -= len(line)
-                    if boundary in line:
-                        break
-                    f.write(line)
+            
+            # Overwriting an existing file does not touch the folder mtime
+            self.asset_server.invalidate_assets_cache()
 
             self.send_json_response({"status": "success", "filename": filename})
             
         except Exception as e:
             logger.error(f"Error handling file upload: {e}")
+            self.close_connection = True
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def handle_config_update(self):
-        """Handle config.py update requests"""
+    def receive_upload_streaming(self, content_type):
+        """Stream a multipart upload to disk in large chunks, returning its filename"""
+        remainbytes = int(self.headers['Content-Length'])
+        
+        # The real name is only known once the part headers are parsed, so write to a
+        # temporary name first; '.part' is not an asset extension, so it is never listed
+        temp_path = os.path.join(self.asset_server.assets_folder,
+                                 f".upload-{threading.get_ident()}.part")
+        target = FileTarget(temp_path)
+        parser = StreamingFormDataParser(headers={'Content-Type': content_type})
+        parser.register('file', target)
+        
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            while remainbytes > 0:
+                chunk = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remainbytes))
+                if not chunk:
+                    break
+                remainbytes -= len(chunk)
+                parser.data_received(chunk)
             
-            config_path = os.path.join(os.path.dirname(__file__), 'config.py')
-            with open(config_path, 'w', encoding='utf-8') as f:
-                f.write(data['config'])
+            if remainbytes > 0:
+                # Client went away mid-upload; keep the existing asset, drop the partial
+                self.close_connection = True
+                self.send_safe_response(400, 'text/plain', 'Upload incomplete')
+                return None
+            
+            filename = target.multipart_filename
+            if not filename:
+                self.send_safe_response(400, 'text/plain', 'No file in upload')
+                return None
+            
+            filepath = self.asset_server.get_asset_path(filename)
+            if not filepath:
+                self.send_safe_response(400, 'text/plain', 'Invalid filename')
+                return None
+            
+            os.replace(temp_path, filepath)
+            return filename
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def receive_upload_lines(self, content_type):
+        """Read a multipart upload line by line, returning its filename"""
+        # Get the boundary
+        boundary = content_type.split('=')[1].encode()
+        remainbytes = int(self.headers['Content-Length'])
+        line = self.rfile.readline()
+        remainbytes -= len(line)
+
+        if not boundary in line:
+            self.send_safe_response(400, 'text/plain', 'Invalid boundary')
+            return None
+
+        # Get filename from Content-Disposition header
+        line = self.rfile.readline()
+        remainbytes -= len(line)
+        filename = line.decode().split('filename=')[1].strip().strip('"')
+
+        # Skip headers
+        while remainbytes > 0:
+            line = self.rfile.readline()
+            remainbytes -= len(line)
+            if line == b'\r\n':
+                break
+
+        # Copy the file data in large blocks up to the closing delimiter. The delimiter
+        # includes the CRLF before it, which is not part of the file.
+        delimiter = b'\r\n--' + boundary
+        keep = len(delimiter) - 1  # enough to catch a delimiter split across two reads
+        tail = b''
+        filepath = self.asset_server.get_asset_path(filename)
+        if not filepath:
+            self.send_safe_response(400, 'text/plain', 'Invalid filename')
+            return None
+        with open(filepath, 'wb') as f:
+            while remainbytes > 0:
+                chunk = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remainbytes))
+                if not chunk:
+                    break
+                remainbytes -= len(chunk)
+                
+                # A delimiter straddling two reads shows up in this small window; the
+                # rest of the chunk is searched in place, without joining it to the tail
+                window = tail + chunk[:keep]
+                end = window.find(delimiter)
+                if end >= 0:
+                    f.write(window[:end])
+                    tail = b''
+                    break
+                
+                f.write(tail)
+                end = chunk.find(delimiter)
+                if end >= 0:
+                    f.write(memoryview(chunk)[:end])
+                    tail = b''
+                    break
+                f.write(memoryview(chunk)[:-keep])
+                tail = chunk[-keep:]
+            f.write(tail)
+        
+        # Drain the closing boundary so the connection is left at the next request
+        while remainbytes > 0:
+            chunk = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remainbytes))
+            if not chunk:
+                break
+            remainbytes -= len(chunk)
+        
+        return filename
+
+    def handle_config_update(self, data):
+        """Handle config.py update requests"""
+        try:
+            # Write a sibling file and swap it in, so readers never see a half-written config
+            temp_path = f"{CONFIG_PATH}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(data['config'])
+                    f.flush()
+                    os.fsync(f.fileno())
+                # Keep config.py's permissions (it holds WiFi credentials), not the umask's
+                if os.path.exists(CONFIG_PATH):
+                    shutil.copymode(CONFIG_PATH, temp_path)
+                os.replace(temp_path, CONFIG_PATH)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
             
             # Update card mapping status after config change
+            self.asset_server.invalidate_config_cache()
             self.asset_server.update_card_mapping_status()
             
             self.send_json_response({"status": "success"})
@@ -933,13 +1607,9 @@ class RequestHandler(BaseHTTPRequestHandler):
             logger.error(f"Error updating config: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def handle_file_rename(self):
+    def handle_file_rename(self, data):
         """Handle file rename requests"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
             old_filename = data.get('old_filename')
             new_filename = data.get('new_filename')
             
@@ -947,19 +1617,23 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.send_safe_response(400, 'text/plain', 'Missing filename parameters')
                 return
             
-            old_path = os.path.join(self.asset_server.assets_folder, old_filename)
-            new_path = os.path.join(self.asset_server.assets_folder, new_filename)
+            old_path = self.asset_server.get_asset_path(old_filename)
+            new_path = self.asset_server.get_asset_path(new_filename)
             
-            if not os.path.exists(old_path):
-                self.send_safe_response(404, 'text/plain', 'File not found')
+            if not old_path or not new_path:
+                self.send_safe_response(400, 'text/plain', 'Invalid filename')
                 return
             
             if os.path.exists(new_path):
                 self.send_safe_response(409, 'text/plain', 'File with new name already exists')
                 return
             
-            # Rename the file
-            os.rename(old_path, new_path)
+            # Rename the file; a missing source surfaces here rather than via a separate stat
+            try:
+                os.rename(old_path, new_path)
+            except FileNotFoundError:
+                self.send_safe_response(404, 'text/plain', 'File not found')
+                return
             
             self.send_json_response({
                 "status": "success", 
@@ -971,27 +1645,27 @@ class RequestHandler(BaseHTTPRequestHandler):
             logger.error(f"Error renaming file: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def handle_file_delete(self):
+    def handle_file_delete(self, data):
         """Handle file deletion requests"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
             filename = data.get('filename')
             
             if not filename:
                 self.send_safe_response(400, 'text/plain', 'Missing filename parameter')
                 return
             
-            file_path = os.path.join(self.asset_server.assets_folder, filename)
+            file_path = self.asset_server.get_asset_path(filename)
             
-            if not os.path.exists(file_path):
-                self.send_safe_response(404, 'text/plain', 'File not found')
+            if not file_path:
+                self.send_safe_response(400, 'text/plain', 'Invalid filename')
                 return
             
-            # Delete the file
-            os.remove(file_path)
+            # Delete the file; a missing file surfaces here rather than via a separate stat
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                self.send_safe_response(404, 'text/plain', 'File not found')
+                return
             
             self.send_json_response({
                 "status": "success", 
@@ -1003,14 +1677,10 @@ class RequestHandler(BaseHTTPRequestHandler):
             logger.error(f"Error deleting file: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def handle_unknown_card(self):
+    def handle_unknown_card(self, data):
         """Handle unknown card scan requests"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            card_id = data.get('card_id')
+            card_id = self._card_id(data)
             
             if not card_id:
                 self.send_safe_response(400, 'text/plain', 'Missing card_id parameter')
@@ -1030,14 +1700,10 @@ class RequestHandler(BaseHTTPRequestHandler):
             logger.error(f"Error handling unknown card scan: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def handle_navigation(self):
+    def handle_navigation(self, data):
         """Handle navigation through card assets using stored asset files"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            card_id = data.get('card_id')
+            card_id = self._card_id(data)
             direction = data.get('direction')
             
             if not card_id:
@@ -1053,37 +1719,30 @@ class RequestHandler(BaseHTTPRequestHandler):
             
             if success:
                 asset_info = self.asset_server.last_asset_info
-                response = {
-                    "success": True,
-                    "card_id": card_id,
-                    "direction": direction,
-                    "asset_file": asset_info['asset_file'],
-                    "asset_index": asset_info['asset_index'],
-                    "total_assets": asset_info['total_assets'],
-                    "message": f"Navigated {direction} to {asset_info['asset_file']} ({asset_info['asset_index'] + 1}/{asset_info['total_assets']})"
-                }
+                self._send_json_ok(_NAVIGATE_RESPONSE % (
+                    json_dumps(card_id),
+                    json_dumps(direction),
+                    json_dumps(asset_info['asset_file']),
+                    json_dumps(asset_info['asset_index']),
+                    json_dumps(asset_info['total_assets']),
+                    json_dumps(f"Navigated {direction} to {asset_info['asset_file']} ({asset_info['asset_index'] + 1}/{asset_info['total_assets']})")
+                ))
             else:
-                response = {
+                self.send_json_response({
                     "success": False,
                     "card_id": card_id,
                     "direction": direction,
                     "message": "Navigation failed - no stored assets or single asset only"
-                }
-            
-            self.send_json_response(response)
+                })
             
         except Exception as e:
             logger.error(f"Error handling navigation: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
-    def handle_card_removal(self):
+    def handle_card_removal(self, data):
         """Handle card removal requests"""
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            card_id = data.get('card_id')
+            card_id = self._card_id(data)
             
             if not card_id:
                 self.send_safe_response(400, 'text/plain', 'Missing card_id parameter')
@@ -1091,27 +1750,32 @@ class RequestHandler(BaseHTTPRequestHandler):
             
             success = self.asset_server.remove_card(card_id)
             
-            response = {
-                "success": success,
-                "card_id": card_id,
-                "action": "card_removed",
-                "message": f"Card {card_id} removed - returning to splash screen",
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            self.send_json_response(response)
+            self._send_json_ok(_CARD_REMOVED_RESPONSE % (
+                json_dumps(success),
+                json_dumps(card_id),
+                json_dumps(f"Card {card_id} removed - returning to splash screen"),
+                json_dumps(now_iso())
+            ))
             
         except Exception as e:
             logger.error(f"Error handling card removal: {e}")
             self.send_safe_response(500, 'text/plain', str(e))
 
 def create_handler(asset_server):
-    """Create request handler with asset server instance"""
-    def handler(*args, **kwargs):
-        return RequestHandler(*args, asset_server=asset_server, **kwargs)
-    return handler
+    """Create a request handler class bound to the asset server instance"""
+    return type('BoundRequestHandler', (RequestHandler,), {'asset_server': asset_server})
 
 class RobustThreadingHTTPServer(ThreadingHTTPServer):
+    # listen() backlog; the default of 5 drops SYNs when kiosks and browsers reconnect at once
+    request_queue_size = 128
+    
+    def server_bind(self):
+        """Bind the listening socket with Nagle disabled"""
+        # SO_REUSEADDR is already set via HTTPServer.allow_reuse_address; accepted
+        # sockets inherit TCP_NODELAY on Linux and setup() sets it elsewhere
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().server_bind()
+    
     def handle_error(self, request, client_address):
         """Handle server errors gracefully"""
         exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -1122,20 +1786,19 @@ class RobustThreadingHTTPServer(ThreadingHTTPServer):
             
         logger.error(f"Error handling request from {client_address}: {exc_value}")
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip():
     """Get local IP address"""
+    # Connecting a UDP socket sends nothing; it only picks the outbound interface.
+    # Hostname resolution is deliberately not used as a fallback since it can
+    # stall for seconds when DNS is broken.
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
-    except Exception:
-        try:
-            hostname = socket.gethostname()
-            return socket.gethostbyname(hostname)
-        except Exception:
-            return "localhost"
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.2)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return "0.0.0.0"
 
 def main():
     print("Exhibition Asset Player Server")
@@ -1152,9 +1815,9 @@ def main():
     print()
     
     asset_server = AssetServer()
-    local_ip = get_local_ip()
+    asset_server.local_ip = get_local_ip()
     
-    print(f"Server starting on: http://{local_ip}:{asset_server.port}")
+    print(f"Server starting on: http://{asset_server.local_ip}:{asset_server.port}")
     print(f"Assets folder: {os.path.abspath(asset_server.assets_folder)}")
     print("Waiting for RFID triggers...")
     
@@ -1166,6 +1829,7 @@ def main():
     except KeyboardInterrupt:
         print("\nServer stopped")
         httpd.shutdown()
+        asset_server.shutdown()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Exhibition Client Base
+Shared by the Pico exhibition clients: settings from config.py and the
+persistent HTTP/1.1 connection card triggers are sent over.
+Upload alongside the client and config.py.
+"""
+
+import socket
+import config
+
+class _ConnectionClosed(OSError):
+    """The server closed the connection before sending a status line"""
+
+class BaseExhibitionClient:
+    def __init__(self):
+        # Configuration from config.py
+        self.WIFI_SSID = config.WIFI_SSID
+        self.WIFI_PASSWORD = config.WIFI_PASSWORD
+        self.SERVER_IP = config.SERVER_IP
+        self.SERVER_PORT = config.SERVER_PORT
+        self.card_assets = config.CARD_ASSETS
+
+        # Persistent HTTP/1.1 connection to the asset server, opened on first use
+        self.sock = None
+        self._server_addr = None  # Resolved on first connect, once WiFi is up
+        self._host = f"{self.SERVER_IP}:{self.SERVER_PORT}".encode()
+
+    def _connect(self):
+        """Open the persistent connection to the asset server"""
+        self._close_socket()
+        if self._server_addr is None:
+            self._server_addr = socket.getaddrinfo(self.SERVER_IP, self.SERVER_PORT)[0][-1]
+        sock = socket.socket()
+        try:
+            sock.settimeout(5)
+            sock.connect(self._server_addr)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def _close_socket(self):
+        if self.sock:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _read_response(self):
+        """Read one HTTP response from the persistent connection"""
+        sock = self.sock
+        line = sock.readline()
+        if not line:
+            raise _ConnectionClosed('connection closed by server')
+        status = int(line.split(None, 2)[1])
+        length = 0
+        keep_alive = True
+        while True:
+            line = sock.readline()
+            if not line or line == b'\r\n':
+                break
+            name, _, value = line.partition(b':')
+            name = name.strip().lower()
+            if name == b'content-length':
+                length = int(value)
+            elif name == b'connection' and value.strip().lower() == b'close':
+                keep_alive = False
+        body = sock.read(length) if length else b''
+        if not keep_alive:
+            self._close_socket()
+        return status, body
+
+    def send_request(self, request, timeout=5, on_sent=None):
+        """Send a complete pre-built HTTP request; returns (status, body)
+
+        on_sent, if given, runs once as soon as the request is on the wire,
+        before the response is awaited.
+        """
+        for attempt in range(2):
+            try:
+                if self.sock is None:
+                    self._connect()
+                self.sock.settimeout(timeout)
+                self.sock.write(request)
+            except OSError:
+                # Server idled the connection out (or it broke); reconnect once
+                self._close_socket()
+                if attempt:
+                    raise
+                continue
+            if on_sent:
+                on_sent()
+                on_sent = None
+            try:
+                return self._read_response()
+            except _ConnectionClosed:
+                # Stale keep-alive connection, closed before the request was read
+                self._close_socket()
+                if attempt:
+                    raise
+            except OSError:
+                # The server may have acted on the request (a slow /play, say),
+                # so it is never sent twice
+                self._close_socket()
+                raise
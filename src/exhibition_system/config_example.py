@@ -18,6 +18,14 @@ WIFI_PASSWORD = "your-wifi-password"    # Your WiFi password
 SERVER_IP = "192.168.1.100"       # Your server's IP address
 SERVER_PORT = 8080                # Default port for the asset server
 
+# Optional: GPIO wired to the RC522 IRQ pad (Pico client only)
+# Leave as None to poll the reader over SPI instead
+RFID_IRQ_PIN = None
+
+# Optional: RC522 SPI clock in Hz (Pico client only)
+# Drop to 2000000 if reads are unreliable over long jumper wires
+RFID_SPI_BAUDRATE = 8000000
+
 # RFID Card to Asset Mapping
 # ------------------------
 # Format: "CARD_ID": "ASSET_FILENAME"
@@ -5,22 +5,28 @@ Reads RFID cards and triggers asset playback on server
 """
 
 import network
-import urequests
 import json
 import time
+import uasyncio
 from machine import Pin, SPI, PWM, UART
 import st7789
 import vga1_bold_16x32 as font
-import config
+from base_client import BaseExhibitionClient
 
-class ExhibitionClient:
+# Display label prefixes; only the value after them changes per repaint
+_SCANS_LBL = "Scans: "
+_COUNT_LBL = "Count: "
+_ID_LBL = "ID: "
+_FILE_LBL = "File: "
+
+class ExhibitionClient(BaseExhibitionClient):
     def __init__(self):
-        # Configuration from config.py
-        self.WIFI_SSID = config.WIFI_SSID
-        self.WIFI_PASSWORD = config.WIFI_PASSWORD
-        self.SERVER_IP = config.SERVER_IP
-        self.SERVER_PORT = config.SERVER_PORT
-        self.card_assets = config.CARD_ASSETS
+        # Settings from config.py and the persistent server connection
+        super().__init__()
+        
+        # Text boxes drawn below the ready-screen header, as (x, y, width);
+        # screen changes erase just these instead of repainting the panel
+        self._body_boxes = []
         
         # Hardware Setup
         self.setup_hardware()
@@ -29,9 +35,22 @@ class ExhibitionClient:
         # State
         self.wifi_connected = False
         self.last_card = None
-        self.last_scan_time = 0
-        self.scan_cooldown = 3.0
+        self.last_scan_time = 0  # ticks_ms of the last accepted scan
+        self.scan_cooldown_ms = 3000
         self.scan_count = 0
+        self._feedback = None  # Task playing the current scan's sound/screen
+        
+        # Cards read while WiFi and the server check are still in progress
+        self._network_ready = False
+        self._pending = []
+        self.PENDING_LIMIT = 4
+        
+        # /play bodies are fixed per card apart from the timestamp, so each is
+        # serialized (and escaped) once here and filled in with % per scan
+        self._play_bodies = {}
+        for card_id, asset_file in self.card_assets.items():
+            self._play_bodies[card_id] = b'{"asset_file":%s,"card_id":%s,"timestamp":%%d}' % (
+                json.dumps(asset_file).encode(), json.dumps(card_id).encode())
     
     def setup_hardware(self):
         """Initialize hardware components"""
@@ -60,6 +79,21 @@ class ExhibitionClient:
         time.sleep(duration)
         self.buzzer.duty_u16(0)
     
+    async def tone(self, frequency=1000, duration_ms=100):
+        """Play a beep while letting the scan loop keep running"""
+        self.buzzer.duty_u16(3000)
+        self.buzzer.freq(frequency)
+        try:
+            await uasyncio.sleep_ms(duration_ms)
+        finally:
+            self.buzzer.duty_u16(0)
+    
+    def _start_feedback(self, coro):
+        """Run a feedback sequence as a task, cutting short any still playing"""
+        if self._feedback and not self._feedback.done():
+            self._feedback.cancel()
+        self._feedback = uasyncio.create_task(coro)
+    
     def show_startup(self):
         """Show startup screen"""
         self.display.fill(0)
@@ -72,11 +106,22 @@ class ExhibitionClient:
         """Update status line on display"""
         y = 100 + (line * 20)
         self.display.fill_rect(0, y, 240, 18, st7789.BLACK)
-        self.display.text(font, message[:15], 10, y, color)
+        self._body_text(message[:15], 10, y, color)
         print(f"Status: {message}")
     
-    def connect_wifi(self):
-        """Connect to WiFi"""
+    def _body_text(self, text, x, y, color):
+        """Draw a line of text and remember its box for _clear_body"""
+        self.display.text(font, text, x, y, color)
+        self._body_boxes.append((x, y, min(len(text) * font.WIDTH, 240 - x)))
+    
+    def _clear_body(self):
+        """Erase only the text drawn since the last clear"""
+        for x, y, w in self._body_boxes:
+            self.display.fill_rect(x, y, w, font.HEIGHT, st7789.BLACK)
+        self._body_boxes = []
+    
+    async def connect_wifi(self):
+        """Connect to WiFi (yields while waiting, so cards can still be read)"""
         self.show_status("Connecting WiFi...", st7789.YELLOW, 1)
         
         wlan = network.WLAN(network.STA_IF)
@@ -89,7 +134,7 @@ class ExhibitionClient:
             timeout = 15
             while not wlan.isconnected() and timeout > 0:
                 self.led.toggle()
-                time.sleep(0.5)
+                await uasyncio.sleep_ms(500)
                 timeout -= 1
         
         if wlan.isconnected():
@@ -108,17 +153,16 @@ class ExhibitionClient:
         """Test connection to asset server"""
         try:
             self.show_status("Testing Server...", st7789.YELLOW, 3)
-            url = f"http://{self.SERVER_IP}:{self.SERVER_PORT}/ping"
-            print(f"Testing server at: {url}")
-            response = urequests.get(url, timeout=5)
+            print(f"Testing server at: http://{self.SERVER_IP}:{self.SERVER_PORT}/ping")
+            # Opens the connection that card triggers will reuse
+            status, _ = self.send_request(b'GET /ping HTTP/1.1\r\nHost: ' + self._host + b'\r\n\r\n')
             
-            if response.status_code == 200:
+            if status == 200:
                 self.show_status("Server OK", st7789.GREEN, 3)
                 self.beep(1200, 0.1)
-                response.close()
                 return True
             else:
-                raise Exception(f"Server error: {response.status_code}")
+                raise Exception(f"Server error: {status}")
                 
         except Exception as e:
             self.show_status("Server Failed", st7789.RED, 3)
@@ -129,68 +173,68 @@ class ExhibitionClient:
     def show_ready(self):
         """Show ready screen"""
         self.display.fill(0)
+        self._body_boxes = []
         
         self.display.text(font, "READY TO SCAN", 20, 20, st7789.GREEN)
         self.display.fill_rect(0, 50, 240, 2, st7789.GREEN)
         
-        self.display.text(font, "Hold RFID card", 25, 80, st7789.WHITE)
-        self.display.text(font, "near reader", 45, 110, st7789.WHITE)
-        self.display.text(font, "3sec cooldown", 25, 130, st7789.CYAN)
+        self.show_ready_body()
+    
+    def show_ready_body(self):
+        """Redraw the ready screen below its header (the header never changes)"""
+        self._clear_body()
+        
+        self._body_text("Hold RFID card", 25, 80, st7789.WHITE)
+        self._body_text("near reader", 45, 110, st7789.WHITE)
+        self._body_text("3sec cooldown", 25, 130, st7789.CYAN)
         
-        self.display.text(font, f"WiFi: OK", 10, 160, st7789.GREEN)
-        self.display.text(font, f"Server: OK", 10, 180, st7789.GREEN)
-        self.display.text(font, f"Scans: {self.scan_count}", 10, 200, st7789.CYAN)
+        self._body_text("WiFi: OK", 10, 160, st7789.GREEN)
+        self._body_text("Server: OK", 10, 180, st7789.GREEN)
+        self._body_text(_SCANS_LBL + str(self.scan_count), 10, 200, st7789.CYAN)
     
-    def show_card_scanned(self, card_id, asset_file):
+    async def show_card_scanned(self, card_id, asset_file):
         """Show feedback when card is scanned"""
-        self.display.fill_rect(0, 80, 240, 80, st7789.BLACK)
+        self._clear_body()
         
-        self.display.text(font, "CARD SCANNED!", 20, 80, st7789.GREEN)
-        self.display.text(font, f"ID: {card_id[:10]}", 10, 110, st7789.YELLOW)
-        self.display.text(font, f"File: {asset_file[:10]}", 10, 140, st7789.CYAN)
-        self.display.text(font, f"Count: {self.scan_count}", 10, 170, st7789.WHITE)
+        self._body_text("CARD SCANNED!", 20, 80, st7789.GREEN)
+        self._body_text(_ID_LBL + card_id[:10], 10, 110, st7789.YELLOW)
+        if isinstance(asset_file, list):
+            asset_file = asset_file[0]  # Multi-asset card: name the first file
+        self._body_text(_FILE_LBL + asset_file[:10], 10, 140, st7789.CYAN)
+        self._body_text(_COUNT_LBL + str(self.scan_count), 10, 170, st7789.WHITE)
         
         # Success sound
-        for freq in [1000, 1200, 1500]:
-            self.beep(freq, 0.1)
+        for freq in (1000, 1200, 1500):
+            await self.tone(freq, 100)
         
-        time.sleep(1.5)
-        self.show_ready()
+        await uasyncio.sleep_ms(1500)
+        self.show_ready_body()
     
-    def show_unknown_card(self, card_id):
+    async def show_unknown_card(self, card_id):
         """Show feedback for unknown cards"""
-        self.display.fill_rect(0, 80, 240, 80, st7789.BLACK)
+        self._clear_body()
         
-        self.display.text(font, "UNKNOWN CARD", 20, 80, st7789.RED)
-        self.display.text(font, f"ID: {card_id[:10]}", 10, 110, st7789.YELLOW)
-        self.display.text(font, "Not configured", 10, 140, st7789.WHITE)
+        self._body_text("UNKNOWN CARD", 20, 80, st7789.RED)
+        self._body_text(_ID_LBL + card_id[:10], 10, 110, st7789.YELLOW)
+        self._body_text("Not configured", 10, 140, st7789.WHITE)
         
         # Error sound
-        self.beep(400, 0.5)
+        await self.tone(400, 500)
         
-        time.sleep(2)
-        self.show_ready()
+        await uasyncio.sleep_ms(2000)
+        self.show_ready_body()
     
     def trigger_asset(self, card_id, asset_file):
         """Send asset trigger command to server"""
         try:
-            url = f"http://{self.SERVER_IP}:{self.SERVER_PORT}/play"
-            data = {
-                "asset_file": asset_file,
-                "card_id": card_id,
-                "timestamp": time.time()
-            }
+            body = self._play_bodies[card_id] % int(time.time())
             
-            response = urequests.post(
-                url, 
-                data=json.dumps(data),
-                headers={'Content-Type': 'application/json'},
+            status, _ = self.send_request(
+                b'POST /play HTTP/1.1\r\nHost: ' + self._host +
+                b'\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n' % len(body) + body,
                 timeout=10
             )
-            
-            success = response.status_code == 200
-            response.close()
-            return success
+            return status == 200
             
         except Exception as e:
             print(f"Failed to trigger asset: {e}")
@@ -199,10 +243,10 @@ class ExhibitionClient:
     def process_card(self, card_id):
         """Process scanned RFID card"""
         card_id = card_id.strip()
-        current_time = time.time()
+        current_time = time.ticks_ms()
         
         # Check cooldown
-        if card_id == self.last_card and (current_time - self.last_scan_time) < self.scan_cooldown:
+        if card_id == self.last_card and time.ticks_diff(current_time, self.last_scan_time) < self.scan_cooldown_ms:
             return
         
         self.last_card = card_id
@@ -216,52 +260,72 @@ class ExhibitionClient:
         if asset_file:
             print(f"Triggering asset: {asset_file}")
             if self.trigger_asset(card_id, asset_file):
-                self.show_card_scanned(card_id, asset_file)
+                self._start_feedback(self.show_card_scanned(card_id, asset_file))
             else:
                 self.show_status("Send Failed", st7789.RED, 4)
-                self.beep(500, 0.3)
+                self._start_feedback(self.tone(500, 300))
         else:
             print(f"Unknown card: {card_id}")
-            self.show_unknown_card(card_id)
+            self._start_feedback(self.show_unknown_card(card_id))
     
-    def run(self):
+    async def _scan_loop(self):
+        """Read cards; until the network is up they are held in _pending"""
+        # The reader sends each card as one 12-byte frame; the stream wakes
+        # this task as soon as a full frame has arrived
+        reader = uasyncio.StreamReader(self.uart)
+        while True:
+            data = await reader.readexactly(12)
+            try:
+                card_id = data.decode("utf-8")
+            except UnicodeDecodeError:
+                print("Error decoding RFID data")
+                continue
+            
+            if self._network_ready:
+                self.process_card(card_id)
+            elif len(self._pending) < self.PENDING_LIMIT:
+                self._pending.append(card_id)
+                self.show_status("Network up...", st7789.CYAN, 4)
+    
+    async def run(self):
         """Main loop"""
         print("Starting Exhibition Client...")
         
-        if not self.connect_wifi():
-            print("WiFi connection failed!")
-            return
-        
-        if not self.test_server():
-            print("Server connection failed!")
-        
-        self.show_ready()
-        
-        print("Ready to scan RFID cards!")
-        print("Mapped assets:")
-        for card_id, asset_file in self.card_assets.items():
-            print(f"  {card_id} -> {asset_file}")
-        
+        # Start reading straight away; a card tapped during the WiFi and
+        # server checks is handled as soon as they finish
+        scan_task = uasyncio.create_task(self._scan_loop())
         try:
-            while True:
-                data = self.uart.read(12)
-                if data:
-                    try:
-                        card_id = data.decode("utf-8")
-                        self.process_card(card_id)
-                    except UnicodeDecodeError:
-                        print("Error decoding RFID data")
-                
-                time.sleep(0.1)
+            if not await self.connect_wifi():
+                print("WiFi connection failed!")
+                scan_task.cancel()
+                return
+            
+            if not self.test_server():
+                print("Server connection failed!")
+            
+            self.show_ready()
+            
+            print("Ready to scan RFID cards!")
+            print("Mapped assets:")
+            for card_id, asset_file in self.card_assets.items():
+                print(f"  {card_id} -> {asset_file}")
+            
+            self._network_ready = True
+            pending, self._pending = self._pending, []
+            for card_id in pending:
+                self.process_card(card_id)
+            
+            await scan_task
                 
         except KeyboardInterrupt:
             print("Client stopped")
+            self._close_socket()
             self.display.fill(0)
             self.display.text(font, "STOPPED", 60, 100, st7789.RED)
 
 def main():
     client = ExhibitionClient()
-    client.run()
+    uasyncio.run(client.run())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
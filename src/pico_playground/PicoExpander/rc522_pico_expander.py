@@ -20,13 +20,22 @@ Feedback Components:
 """
 
 import network
-import urequests
 import json
+import errno
+import socket
 import time
 import gc  # Garbage collection for memory management
+import micropython
 from machine import Pin, SPI, PWM
 import config
 
+_HEX = b'0123456789abcdef'
+
+@micropython.viper
+def _xor4(data: ptr8) -> int:
+    # Anticollision check byte of a 4-byte UID
+    return data[0] ^ data[1] ^ data[2] ^ data[3]
+
 class MFRC522:
     NRSTPD = 22
     MAX_LEN = 16
@@ -53,6 +62,11 @@ class MFRC522:
     PICC_TRANSFER = 0xB0
     PICC_HALT = 0x50
 
+    # Fixed request frames, passed straight to the FIFO writer
+    _REQIDL_BUF = bytes([PICC_REQIDL])
+    _REQALL_BUF = bytes([PICC_REQALL])
+    _ANTICOLL_BUF = bytes([PICC_ANTICOLL, 0x20])
+
     MI_OK = 0
     MI_NOTAGERR = 1
     MI_ERR = 2
@@ -79,6 +93,20 @@ class MFRC522:
         self.spi = spi
         self.cs = cs
         self.rst = rst
+        # Reused SPI buffers: [address, data] out, [-, data] back
+        self._tx = bytearray(2)
+        self._rx = bytearray(2)
+        # FIFOLevelReg and ControlReg are always read together after a transceive
+        self._level_tx = bytearray([((self.FIFOLevelReg << 1) & 0x7E) | 0x80,
+                                    ((self.ControlReg << 1) & 0x7E) | 0x80, 0])
+        self._level_rx = bytearray(3)
+        # FIFO bursts: one address byte, then up to MAX_LEN bytes of data
+        self._fifo_tx = bytearray(self.MAX_LEN + 1)
+        self._fifo_tx[0] = (self.FIFODataReg << 1) & 0x7E
+        self._fifo_rx_tx = bytearray([((self.FIFODataReg << 1) & 0x7E) | 0x80] * self.MAX_LEN + [0])
+        self._fifo_rx = bytearray(self.MAX_LEN + 1)
+        # Replies are returned as views into _fifo_rx, valid until the next command
+        self._fifo_rx_mv = memoryview(self._fifo_rx)
         self.cs.value(1)
         if self.rst:
             self.rst.value(1)
@@ -92,17 +120,51 @@ class MFRC522:
             time.sleep(0.05)  # Reduced from 0.1s
         self.Write_MFRC522(self.CommandReg, self.PCD_RESETPHASE)
 
+    @micropython.native
     def Write_MFRC522(self, addr, val):
+        cs = self.cs
+        tx = self._tx
+        tx[0] = (addr << 1) & 0x7E
+        tx[1] = val
+        cs.value(0)
+        self.spi.write(tx)
+        cs.value(1)
+
+    @micropython.native
+    def Read_MFRC522(self, addr):
+        # Address out and data back in a single full-duplex transfer
+        cs = self.cs
+        tx = self._tx
+        rx = self._rx
+        tx[0] = ((addr << 1) & 0x7E) | 0x80
+        tx[1] = 0
+        cs.value(0)
+        self.spi.write_readinto(tx, rx)
+        cs.value(1)
+        return rx[1]
+
+    def _fifo_write_burst(self, data):
+        # The FIFO register keeps its address, so the payload follows one address byte
+        n = len(data)
+        self._fifo_tx[1:n + 1] = data
         self.cs.value(0)
-        self.spi.write(bytes([(addr << 1) & 0x7E, val]))
+        self.spi.write(memoryview(self._fifo_tx)[:n + 1])
         self.cs.value(1)
 
-    def Read_MFRC522(self, addr):
+    def _fifo_read_burst(self, n):
+        # Each repeated read address clocks out the next FIFO byte
         self.cs.value(0)
-        self.spi.write(bytes([((addr << 1) & 0x7E) | 0x80]))
-        result = self.spi.read(1)
+        self.spi.write_readinto(memoryview(self._fifo_rx_tx)[self.MAX_LEN - n:],
+                                self._fifo_rx_mv[:n + 1])
         self.cs.value(1)
-        return result[0]
+        return self._fifo_rx_mv[1:n + 1]
+
+    def _read_fifo_level(self):
+        # One CS frame: each address byte clocks out the previous register's value
+        self.cs.value(0)
+        self.spi.write_readinto(self._level_tx, self._level_rx)
+        self.cs.value(1)
+        return self._level_rx[1], self._level_rx[2]
 
     def SetBitMask(self, reg, mask):
         tmp = self.Read_MFRC522(reg)
@@ -114,11 +176,11 @@ class MFRC522:
 
     def AntennaOn(self):
         temp = self.Read_MFRC522(self.TxControlReg)
-        if(~(temp & 0x03)):
+        if (temp & 0x03) != 0x03:
             self.SetBitMask(self.TxControlReg, 0x03)
 
     def MFRC522_ToCard(self, command, sendData):
-        backData = []
+        backData = self._fifo_rx_mv[:0]
         backLen = 0
         status = self.MI_ERR
         irqEn = 0x00
@@ -132,13 +194,14 @@ class MFRC522:
             waitIRq = 0x30
 
         self.Write_MFRC522(self.CommIEnReg, irqEn | 0x80)
-        self.ClearBitMask(self.CommIrqReg, 0x80)
-        self.SetBitMask(self.FIFOLevelReg, 0x80)
+        # Plain writes, no read-modify-write: with Set1 (bit 7) clear, 0x7F clears
+        # every IRQ flag; FlushBuffer is the only writable bit in FIFOLevelReg
+        self.Write_MFRC522(self.CommIrqReg, 0x7F)
+        self.Write_MFRC522(self.FIFOLevelReg, 0x80)
 
         self.Write_MFRC522(self.CommandReg, self.PCD_IDLE)
 
-        for i in range(len(sendData)):
-            self.Write_MFRC522(self.FIFODataReg, sendData[i])
+        self._fifo_write_burst(sendData)
 
         self.Write_MFRC522(self.CommandReg, command)
 
@@ -146,11 +209,14 @@ class MFRC522:
             self.SetBitMask(self.BitFramingReg, 0x80)
 
         # Reduced timeout for faster response
+        read = self.Read_MFRC522  # Bound once for the poll below
+        comm_irq = self.CommIrqReg
         i = 1500  # Reduced from 2000
         while True:
-            n = self.Read_MFRC522(self.CommIrqReg)
+            n = read(comm_irq)
             i = i - 1
-            if ~((i != 0) and ~(n & 0x01) and ~(n & waitIRq)):
+            # Stop on timeout, timer IRQ, or the command's completion IRQ
+            if i == 0 or (n & 0x01) or (n & waitIRq):
                 break
 
         self.ClearBitMask(self.BitFramingReg, 0x80)
@@ -163,8 +229,8 @@ class MFRC522:
                     status = self.MI_NOTAGERR
 
                 if command == self.PCD_TRANSCEIVE:
-                    n = self.Read_MFRC522(self.FIFOLevelReg)
-                    lastBits = self.Read_MFRC522(self.ControlReg) & 0x07
+                    n, lastBits = self._read_fifo_level()
+                    lastBits &= 0x07
                     if lastBits != 0:
                         backLen = (n - 1) * 8 + lastBits
                     else:
@@ -175,19 +241,14 @@ class MFRC522:
                     if n > self.MAX_LEN:
                         n = self.MAX_LEN
 
-                    for i in range(n):
-                        backData.append(self.Read_MFRC522(self.FIFODataReg))
+                    backData = self._fifo_read_burst(n)
 
         return (status, backData, backLen)
 
     def MFRC522_Request(self, reqMode):
-        status = None
-        backBits = None
-        TagType = []
-
         self.Write_MFRC522(self.BitFramingReg, 0x07)
 
-        TagType.append(reqMode)
+        TagType = self._REQIDL_BUF if reqMode == self.PICC_REQIDL else self._REQALL_BUF
         (status, backData, backBits) = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, TagType)
 
         if ((status != self.MI_OK) | (backBits != 0x10)):
@@ -196,24 +257,13 @@ class MFRC522:
         return (status, backBits)
 
     def MFRC522_Anticoll(self):
-        backData = []
-        serNumCheck = 0
-
-        serNum = []
-
         self.Write_MFRC522(self.BitFramingReg, 0x00)
 
-        serNum.append(self.PICC_ANTICOLL)
-        serNum.append(0x20)
-
-        (status, backData, backBits) = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, serNum)
+        (status, backData, backBits) = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, self._ANTICOLL_BUF)
 
         if(status == self.MI_OK):
-            i = 0
             if len(backData) == 5:
-                for i in range(4):
-                    serNumCheck = serNumCheck ^ backData[i]
-                if serNumCheck != backData[4]:
+                if _xor4(backData) != backData[4]:
                     status = self.MI_ERR
             else:
                 status = self.MI_ERR
@@ -245,33 +295,75 @@ class ExhibitionClientPico:
         self.SERVER_PORT = config.SERVER_PORT
         self.card_assets = config.CARD_ASSETS
 
+        # UID text is assembled in place: "aa:bb:cc:dd:ee"
+        self._uid_buf = bytearray(b'00:00:00:00:00')
+
+        # Outgoing requests, sent from the scan loop over a non-blocking socket
+        self.OUTBOX_LIMIT = 8
+        self._outbox = []
+        self._out_sock = None
+        self._out_buf = None
+        self._out_started = 0
+        self._server_addr = None
+        self._ping_request = (b'GET /ping HTTP/1.1\r\nHost: ' +
+                              f'{self.SERVER_IP}:{self.SERVER_PORT}'.encode() +
+                              b'\r\nConnection: close\r\n\r\n')
+        self._request_head = (b'POST %s HTTP/1.1\r\nHost: ' +
+                              f'{self.SERVER_IP}:{self.SERVER_PORT}'.encode() +
+                              b'\r\nContent-Type: application/json\r\nContent-Length: %d'
+                              b'\r\nConnection: close\r\n\r\n')
+
+        # The mapping is fixed at boot, so each card's /play request is built once,
+        # keyed by the raw UID bytes so a scan can look it up without formatting.
+        # No timestamp: the server stamps events with its own clock.
+        self._play_requests = {}
+        for card_id, assets in self.card_assets.items():
+            # Handle both old format (string) and new format (list)
+            if isinstance(assets, str):
+                assets = [assets]
+            if not assets:
+                continue
+            try:
+                uid = bytes.fromhex(card_id.replace(':', ''))
+            except ValueError:
+                print(f"Skipping mapping with non-hex card ID: {card_id}")
+                continue
+            body = json.dumps({"card_id": card_id, "asset_files": assets}).encode()
+            self._play_requests[uid] = self._request_head % (b'/play', len(body)) + body
+
         # Hardware Setup
         self.setup_hardware()
 
         # Optimized state management
         self.wifi_connected = False
         self.current_card = None
+        self.current_uid = None  # Raw UID bytes of current_card
         self.card_present = False
         self.card_processed = False  # Track if current card has been processed
         self.last_process_time = 0
         self.process_cooldown = 1.0  # Reduced from 1.5 seconds
 
-        # Simplified card detection
-        self.consecutive_detections = 0
-        self.consecutive_failures = 0
+        # Card detection: a card counts as present from its first read and as
+        # removed once it has not been read for REMOVAL_DEBOUNCE_MS. A card left
+        # on the reader only answers every other REQA, so single misses are noise.
+        self._last_seen_ms = 0
+        self.REMOVAL_DEBOUNCE_MS = 150
 
-        # Performance constants
-        self.DETECTION_THRESHOLD = 2  # Reduced from 3
-        self.REMOVAL_THRESHOLD = 15   # Much higher threshold for stable removal detection
+        # Idle polling: consecutive empty polls decide how long the loop sleeps
+        self._idle_ticks = 0
+
+        # Feedback steps as (deadline_ms, led, frequency), applied by run_feedback()
+        # each loop pass so LED and buzzer patterns never stall card polling
+        self._fx_queue = []
 
         # Performance monitoring
         self.scan_count = 0
         self.start_time = time.time()
         self.last_stats_time = time.time()
 
-        # Memory management
-        self.gc_counter = 0
-        self.GC_INTERVAL = 100  # Run GC every 100 scans
+        # Memory management: collect once a quarter of the free heap has been
+        # allocated, rather than on a fixed scan count
+        gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
 
     def setup_hardware(self):
         """Initialize hardware components with optimized settings"""
@@ -296,8 +388,10 @@ class ExhibitionClientPico:
         rst.value(1)
 
         # Initialize SPI with higher baudrate for better performance
+        # (the RC522 is rated to 10MHz)
+        baudrate = 8000000
         spi = SPI(0,
-                  baudrate=2000000,  # Increased from 1MHz to 2MHz
+                  baudrate=baudrate,
                   polarity=0,
                   phase=0,
                   bits=8,
@@ -308,42 +402,72 @@ class ExhibitionClientPico:
 
         self.rfid = MFRC522(spi, cs, rst)
 
+        # VersionReg reads back 0x00/0xFF when the reader can't keep up with the
+        # clock (typically long jumper leads); halve it once and re-initialise
+        if self.rfid.Read_MFRC522(self.rfid.VersionReg) in (0x00, 0xFF):
+            baudrate //= 2
+            print(f"RC522 not responding, retrying at {baudrate}Hz")
+            spi.init(baudrate=baudrate)
+            self.rfid.MFRC522_Init()
+
         print("Hardware initialized with performance optimizations!")
-        print("RC522 RFID Reader ready (2MHz SPI)")
+        print(f"RC522 RFID Reader ready ({baudrate // 1000000}MHz SPI)")
         print("LEDs and buzzer ready")
 
     def beep(self, frequency=1000, duration=0.15):  # Restored reasonable duration
-        """Play a beep sound"""
+        """Play a beep sound (blocking; used at startup before the loop runs)"""
         self.buzzer.duty_u16(5000)
         self.buzzer.freq(frequency)
         time.sleep(duration)
         self.buzzer.duty_u16(0)
 
+    def schedule_feedback(self, steps):
+        """Queue (offset_ms, led, frequency) steps, replacing any pattern in progress.
+        led None leaves the LEDs alone; frequency None leaves the buzzer alone, 0 silences it."""
+        now = time.ticks_ms()
+        self._fx_queue = [(time.ticks_add(now, offset), led, freq) for offset, led, freq in steps]
+
+    def run_feedback(self):
+        """Apply every queued feedback step that has fallen due"""
+        queue = self._fx_queue
+        if not queue:
+            return
+        now = time.ticks_ms()
+        while queue and time.ticks_diff(now, queue[0][0]) >= 0:
+            _, led, freq = queue.pop(0)
+            if led is not None:
+                self.led.value(led)
+                self.onboard_led.value(led)
+            if freq is not None:
+                if freq:
+                    self.buzzer.freq(freq)
+                    self.buzzer.duty_u16(5000)
+                else:
+                    self.buzzer.duty_u16(0)
+
+    def finish_feedback(self):
+        """Block until the queued pattern has played (outside the main loop)"""
+        while self._fx_queue:
+            self.run_feedback()
+            time.sleep_ms(10)
+
     def success_feedback(self):
         """Provide optimized success feedback"""
-        # Faster LED pattern
-        for _ in range(2):  # Reduced from 3
-            self.led.on()
-            self.onboard_led.on()
-            time.sleep(0.05)  # Reduced from 0.1
-            self.led.off()
-            self.onboard_led.off()
-            time.sleep(0.05)
-
-        # Pleasant success tone
-        self.beep(1200, 0.2)
+        # Two quick flashes, then a pleasant success tone
+        self.schedule_feedback((
+            (0, 1, None), (50, 0, None),
+            (100, 1, None), (150, 0, 1200),
+            (350, None, 0),
+        ))
 
     def error_feedback(self):
         """Provide optimized error feedback"""
-        # Shorter LED flash
-        self.led.on()
-        self.onboard_led.on()
-        time.sleep(0.2)  # Reduced from 0.5
-        self.led.off()
-        self.onboard_led.off()
-
-        # Clear error tone
-        self.beep(500, 0.25)  # Longer for better error indication
+        # Short LED flash, then a clear (longer) error tone
+        self.schedule_feedback((
+            (0, 1, None),
+            (200, 0, 500),
+            (450, None, 0),
+        ))
 
     def connect_wifi(self):
         """Optimized WiFi connection"""
@@ -400,148 +524,147 @@ class ExhibitionClientPico:
 
         print("WiFi connection failed!")
         self.error_feedback()
+        self.finish_feedback()
         return False
 
     def test_server(self):
         """Test server connection with shorter timeout"""
         try:
             print("Testing server connection...")
-            url = f"http://{self.SERVER_IP}:{self.SERVER_PORT}/ping"
-            response = urequests.get(url, timeout=3)  # Reduced from 5s
-
-            if response.status_code == 200:
+            # Resolve the address now so the first tap doesn't pay for it
+            self._server_addr = socket.getaddrinfo(self.SERVER_IP, self.SERVER_PORT)[0][-1]
+            sock = socket.socket()
+            try:
+                sock.settimeout(3)  # Reduced from 5s
+                sock.connect(self._server_addr)
+                sock.write(self._ping_request)
+                status_line = sock.readline()
+            finally:
+                sock.close()
+
+            if b' 200 ' in status_line:
                 print("Server connection OK!")
                 self.beep(1200, 0.15)
-                response.close()
                 return True
             else:
-                raise Exception(f"Server error: {response.status_code}")
+                raise Exception(f"Server error: {status_line.strip()}")
 
         except Exception as e:
             print(f"Server test failed: {e}")
             self.error_feedback()
+            self.finish_feedback()
             return False
 
-    def trigger_card_assets(self, card_id):
-        """Optimized card trigger with shorter timeout and better memory management"""
-        response = None
-        try:
-            # Get assets for this card from local mapping
-            assets = self.card_assets.get(card_id, [])
+    def queue_request(self, path, data):
+        """Queue a JSON POST; the scan loop sends it without blocking"""
+        body = json.dumps(data).encode()
+        self._queue(self._request_head % (path, len(body)) + body)
 
-            # Handle both old format (string) and new format (list)
-            if isinstance(assets, str):
-                assets = [assets]
+    def _queue(self, request):
+        if len(self._outbox) >= self.OUTBOX_LIMIT:
+            print("Outbox full, dropping oldest request")
+            self._outbox.pop(0)
+        self._outbox.append(request)
 
-            if not assets:
-                print(f"No assets mapped for card: {card_id}")
-                return False
-
-            url = f"http://{self.SERVER_IP}:{self.SERVER_PORT}/play"
-            data = {
-                "card_id": card_id,  # Still send for logging purposes
-                "asset_files": assets,  # Send the actual asset filenames
-                "timestamp": time.time()
-            }
-
-            response = urequests.post(
-                url,
-                data=json.dumps(data),
-                headers={'Content-Type': 'application/json'},
-                timeout=5  # Reduced from 10s
-            )
-
-            success = response.status_code == 200
-            if success:
-                # Parse response efficiently
-                try:
-                    response_data = response.json()
-                    asset_file = response_data.get('asset_file', 'Unknown')
-                    asset_index = response_data.get('asset_index', 0)
-                    total_assets = response_data.get('total_assets', 1)
-                    print(f"Asset: {asset_file} ({asset_index + 1}/{total_assets})")
-                except:
-                    pass
-
-            return success
+    def _close_outgoing(self):
+        try:
+            self._out_sock.close()
+        except OSError:
+            pass
+        self._out_sock = None
+        self._out_buf = None
+
+    def drain_outbox(self):
+        """Advance the queued requests by one non-blocking step per loop pass"""
+        if self._out_sock is None:
+            if not self._outbox:
+                return
+            request = self._outbox.pop(0)
+            sock = None
+            try:
+                if self._server_addr is None:
+                    self._server_addr = socket.getaddrinfo(self.SERVER_IP, self.SERVER_PORT)[0][-1]
+                sock = socket.socket()
+                sock.setblocking(False)
+                sock.connect(self._server_addr)
+            except OSError as e:
+                if sock is None or e.errno != errno.EINPROGRESS:
+                    # Drop the request rather than retry it on every pass
+                    if sock:
+                        sock.close()
+                    print(f"Server connect failed, request dropped: {e}")
+                    return
+            self._out_sock = sock
+            self._out_buf = memoryview(request)
+            self._out_started = time.ticks_ms()
+            return
 
-        except Exception as e:
-            print(f"Failed to trigger card assets: {e}")
+        try:
+            if self._out_buf:
+                # Write as much as the socket takes; None means not connected yet
+                n = self._out_sock.write(self._out_buf)
+                if n:
+                    self._out_buf = self._out_buf[n:]
+            else:
+                # Request sent; read the reply until the server closes
+                data = self._out_sock.read(128)
+                if data == b'':
+                    self._close_outgoing()
+                    return
+                if data and data.startswith(b'HTTP/') and data[9:12] != b'200':
+                    print(f"Server error: {data[9:12].decode()}")
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EINPROGRESS):
+                print(f"Request failed: {e}")
+                self._close_outgoing()
+                return
+
+        if time.ticks_diff(time.ticks_ms(), self._out_started) > 5000:
+            print("Request timed out")
+            self._close_outgoing()
+
+    def trigger_card_assets(self, uid, card_id):
+        """Queue the play request for a mapped card (looked up by raw UID bytes);
+        False if the card has no assets"""
+        request = self._play_requests.get(uid)
+
+        if not request:
+            print(f"No assets mapped for card: {card_id}")
             return False
-        finally:
-            if response:
-                response.close()
-                response = None
-            gc.collect()
 
-    def trigger_unknown_card(self, card_id):
-        """Optimized unknown card logging"""
-        response = None
-        try:
-            url = f"http://{self.SERVER_IP}:{self.SERVER_PORT}/unknown-card"
-            data = {
-                "card_id": card_id,
-                "timestamp": time.time()
-            }
-
-            response = urequests.post(
-                url,
-                data=json.dumps(data),
-                headers={'Content-Type': 'application/json'},
-                timeout=3  # Reduced timeout
-            )
-
-            success = response.status_code == 200
-            if success:
-                print(f"Unknown card {card_id} logged")
-            return success
+        self._queue(request)
+        return True
 
-        except Exception as e:
-            print(f"Failed to log unknown card: {e}")
-            return False
-        finally:
-            if response:
-                response.close()
-            gc.collect()
+    def trigger_unknown_card(self, card_id):
+        """Queue unknown card logging"""
+        self.queue_request(b'/unknown-card', {
+            "card_id": card_id,
+            "timestamp": time.time()
+        })
 
     def trigger_card_removal(self, card_id):
-        """Optimized card removal signal"""
-        response = None
-        try:
-            url = f"http://{self.SERVER_IP}:{self.SERVER_PORT}/card-removed"
-            data = {
-                "card_id": card_id,
-                "timestamp": time.time()
-            }
-
-            response = urequests.post(
-                url,
-                data=json.dumps(data),
-                headers={'Content-Type': 'application/json'},
-                timeout=3  # Reduced timeout
-            )
-
-            success = response.status_code == 200
-            if success:
-                print(f"Card {card_id} removal signaled")
-            return success
-
-        except Exception as e:
-            print(f"Failed to signal card removal: {e}")
-            return False
-        finally:
-            if response:
-                response.close()
-            gc.collect()
+        """Queue the card removal signal"""
+        self.queue_request(b'/card-removed', {
+            "card_id": card_id,
+            "timestamp": time.time()
+        })
 
+    @micropython.native
     def format_uid(self, uid):
         """Format the UID as a hex string with colons between bytes"""
-        return ':'.join(f'{x:02x}' for x in uid)
-
-    def process_card(self, card_id):
+        buf = self._uid_buf
+        for i in range(5):
+            v = uid[i]
+            j = i * 3
+            buf[j] = _HEX[v >> 4]
+            buf[j + 1] = _HEX[v & 0x0F]
+        return str(buf, 'ascii')
+
+    def process_card(self, card_id, uid):
         """Optimized card processing with simplified state management"""
         # Process the card (cooldown logic is handled in main loop)
         self.current_card = card_id
+        self.current_uid = uid
         self.last_process_time = time.time()
         self.scan_count += 1
 
@@ -551,20 +674,17 @@ class ExhibitionClientPico:
         self.led.on()
         self.onboard_led.on()
 
-        # Try to trigger card assets (mapping check is now inside trigger_card_assets)
-        if self.trigger_card_assets(card_id):
-            # Successfully triggered assets
+        # Queue the play request (mapping check is inside trigger_card_assets);
+        # feedback no longer waits for the server
+        if self.trigger_card_assets(uid, card_id):
+            # Request queued for a mapped card
             self.success_feedback()
         else:
-            # Failed to trigger (either no mapping or server error)
+            # No mapping for this card
             print(f"Failed to trigger assets for card: {card_id}")
             self.error_feedback()
             self.trigger_unknown_card(card_id)
 
-        # Turn off LEDs
-        self.led.off()
-        self.onboard_led.off()
-
         return True
 
     def print_performance_stats(self):
@@ -582,7 +702,7 @@ class ExhibitionClientPico:
         """Optimized main loop"""
         print("Starting Performance-Optimized Exhibition Client...")
         print("Performance improvements:")
-        print("- Faster SPI (2MHz)")
+        print("- Faster SPI (8MHz)")
         print("- Reduced delays and timeouts")
         print("- Optimized card detection")
         print("- Better memory management")
@@ -616,40 +736,23 @@ class ExhibitionClientPico:
                     (status, uid) = self.rfid.MFRC522_Anticoll()
                     if status == self.rfid.MI_OK:
                         # Successful detection
-                        self.consecutive_detections += 1
-                        self.consecutive_failures = 0
+                        self._last_seen_ms = time.ticks_ms()
 
                         # Process card with strict duplicate prevention
-                        card_id = self.format_uid(uid)
+                        # (uid may be a view of the reader's buffer; keep a copy)
+                        uid = bytes(uid)
 
-                        # Only process if it's a genuinely new card or hasn't been processed yet
-                        should_process = False
-                        current_time = time.time()
-
-                        if card_id != self.current_card:
-                            # Different card, always process
-                            should_process = True
-                        elif not self.card_processed:
-                            # Same card but not processed yet, process it
-                            should_process = True
-                        # If same card and already processed, do NOT process again
-
-                        if should_process:
+                        # Only process if it's a genuinely new card or hasn't been processed yet.
+                        # A held card is recognised from its raw bytes, so the hex ID is
+                        # only formatted for a card that is actually processed.
+                        if uid != self.current_uid or not self.card_processed:
                             self.card_present = True
-                            self.process_card(card_id)
+                            self.process_card(self.format_uid(uid), uid)
                             self.card_processed = True  # Mark as processed
 
-                    else:
-                        # Failed UID read
-                        self.consecutive_failures += 1
-                        self.consecutive_detections = 0
-                else:
-                    # No card detected
-                    self.consecutive_failures += 1
-                    self.consecutive_detections = 0
-
-                # Check for card removal
-                if self.consecutive_failures >= self.REMOVAL_THRESHOLD and self.card_present:
+                # Check for card removal: nothing read for the whole debounce window
+                if (self.card_present and
+                        time.ticks_diff(time.ticks_ms(), self._last_seen_ms) > self.REMOVAL_DEBOUNCE_MS):
                     self.card_present = False
                     self.card_processed = False  # Reset processed flag
                     if self.current_card:
@@ -657,18 +760,26 @@ class ExhibitionClientPico:
                         print("Card removed")
                         # Keep current_card for potential re-placement detection
 
-                # Memory management
-                self.gc_counter += 1
-                if self.gc_counter >= self.GC_INTERVAL:
-                    gc.collect()
-                    self.gc_counter = 0
+                # Send queued requests and advance any feedback pattern
+                self.drain_outbox()
+                self.run_feedback()
 
                 # Performance monitoring
                 if scan_counter % 300 == 0:  # Every 300 scans
                     self.print_performance_stats()
 
-                # Optimized loop delay
-                time.sleep(0.03)  # Reduced from 0.1s to 0.03s for 33% faster scanning
+                # Loop delay: fast while a card is around or was just seen,
+                # slowing down the longer the reader has been empty
+                if status == self.rfid.MI_OK:
+                    self._idle_ticks = 0
+                else:
+                    self._idle_ticks += 1
+                if self.card_present or self._idle_ticks < 20:
+                    time.sleep_ms(30)
+                elif self._idle_ticks < 200:
+                    time.sleep_ms(100)
+                else:
+                    time.sleep_ms(250)
 
         except KeyboardInterrupt:
             print("\nClient stopped")
@@ -11,23 +11,56 @@ Connections:
 """
 
 from machine import Pin, SPI
+from micropython import const
 import time
 
+# Register addresses, commands and status codes the driver uses internally;
+# const() lets the compiler inline them. Public names stay on the class.
+_MAX_LEN = const(16)
+_PCD_IDLE = const(0x00)
+_PCD_AUTHENT = const(0x0E)
+_PCD_TRANSCEIVE = const(0x0C)
+_PCD_RESETPHASE = const(0x0F)
+_PCD_CALCCRC = const(0x03)
+_PICC_ANTICOLL = const(0x93)
+_MI_OK = const(0)
+_MI_NOTAGERR = const(1)
+_MI_ERR = const(2)
+_CommandReg = const(0x01)
+_CommIEnReg = const(0x02)
+_CommIrqReg = const(0x04)
+_DivIrqReg = const(0x05)
+_ErrorReg = const(0x06)
+_FIFODataReg = const(0x09)
+_FIFOLevelReg = const(0x0A)
+_ControlReg = const(0x0C)
+_BitFramingReg = const(0x0D)
+_ModeReg = const(0x11)
+_TxControlReg = const(0x14)
+_TxAutoReg = const(0x15)
+_CRCResultRegM = const(0x21)
+_CRCResultRegL = const(0x22)
+_TModeReg = const(0x2A)
+_TPrescalerReg = const(0x2B)
+_TReloadRegH = const(0x2C)
+_TReloadRegL = const(0x2D)
+_VersionReg = const(0x37)
+
 class MFRC522:
     NRSTPD = 22
-    MAX_LEN = 16
+    MAX_LEN = _MAX_LEN
 
-    PCD_IDLE = 0x00
-    PCD_AUTHENT = 0x0E
+    PCD_IDLE = _PCD_IDLE
+    PCD_AUTHENT = _PCD_AUTHENT
     PCD_RECEIVE = 0x08
     PCD_TRANSMIT = 0x04
-    PCD_TRANSCEIVE = 0x0C
-    PCD_RESETPHASE = 0x0F
-    PCD_CALCCRC = 0x03
+    PCD_TRANSCEIVE = _PCD_TRANSCEIVE
+    PCD_RESETPHASE = _PCD_RESETPHASE
+    PCD_CALCCRC = _PCD_CALCCRC
 
     PICC_REQIDL = 0x26
     PICC_REQALL = 0x52
-    PICC_ANTICOLL = 0x93
+    PICC_ANTICOLL = _PICC_ANTICOLL
     PICC_SElECTTAG = 0x93
     PICC_AUTHENT1A = 0x60
     PICC_AUTHENT1B = 0x61
@@ -39,33 +72,33 @@ class MFRC522:
     PICC_TRANSFER = 0xB0
     PICC_HALT = 0x50
 
-    MI_OK = 0
-    MI_NOTAGERR = 1
-    MI_ERR = 2
+    MI_OK = _MI_OK
+    MI_NOTAGERR = _MI_NOTAGERR
+    MI_ERR = _MI_ERR
 
     Reserved00 = 0x00
-    CommandReg = 0x01
-    CommIEnReg = 0x02
+    CommandReg = _CommandReg
+    CommIEnReg = _CommIEnReg
     DivlEnReg = 0x03
-    CommIrqReg = 0x04
-    DivIrqReg = 0x05
-    ErrorReg = 0x06
+    CommIrqReg = _CommIrqReg
+    DivIrqReg = _DivIrqReg
+    ErrorReg = _ErrorReg
     Status1Reg = 0x07
     Status2Reg = 0x08
-    FIFODataReg = 0x09
-    FIFOLevelReg = 0x0A
+    FIFODataReg = _FIFODataReg
+    FIFOLevelReg = _FIFOLevelReg
     WaterLevelReg = 0x0B
-    ControlReg = 0x0C
-    BitFramingReg = 0x0D
+    ControlReg = _ControlReg
+    BitFramingReg = _BitFramingReg
     CollReg = 0x0E
     Reserved01 = 0x0F
 
     Reserved10 = 0x10
-    ModeReg = 0x11
+    ModeReg = _ModeReg
     TxModeReg = 0x12
     RxModeReg = 0x13
-    TxControlReg = 0x14
-    TxAutoReg = 0x15
+    TxControlReg = _TxControlReg
+    TxAutoReg = _TxAutoReg
     TxSelReg = 0x16
     RxSelReg = 0x17
     RxThresholdReg = 0x18
@@ -78,8 +111,8 @@ class MFRC522:
     SerialSpeedReg = 0x1F
 
     Reserved20 = 0x20
-    CRCResultRegM = 0x21
-    CRCResultRegL = 0x22
+    CRCResultRegM = _CRCResultRegM
+    CRCResultRegL = _CRCResultRegL
     Reserved21 = 0x23
     ModWidthReg = 0x24
     Reserved22 = 0x25
@@ -87,10 +120,10 @@ class MFRC522:
     GsNReg = 0x27
     CWGsPReg = 0x28
     ModGsPReg = 0x29
-    TModeReg = 0x2A
-    TPrescalerReg = 0x2B
-    TReloadRegH = 0x2C
-    TReloadRegL = 0x2D
+    TModeReg = _TModeReg
+    TPrescalerReg = _TPrescalerReg
+    TReloadRegH = _TReloadRegH
+    TReloadRegL = _TReloadRegL
     TCounterValueRegH = 0x2E
     TCounterValueRegL = 0x2F
 
@@ -101,7 +134,7 @@ class MFRC522:
     TestPinValueReg = 0x34
     TestBusReg = 0x35
     AutoTestReg = 0x36
-    VersionReg = 0x37
+    VersionReg = _VersionReg
     AnalogTestReg = 0x38
     TestDAC1Reg = 0x39
     TestDAC2Reg = 0x3A
@@ -115,22 +148,62 @@ class MFRC522:
         self.spi = spi
         self.cs = cs
         self.cs.value(1)
+        # Reused SPI frames: register access is [address, data]
+        self._tx = bytearray(2)
+        self._rx = bytearray(2)
+        self._addr = bytearray(1)
+        self._irq_tx = bytearray((((_CommIrqReg << 1) & 0x7E) | 0x80, 0))
+        # FIFO reads never exceed MAX_LEN bytes; frames are sliced from these
+        self._burst_tx = bytearray(_MAX_LEN + 1)
+        self._burst_rx = bytearray(_MAX_LEN + 1)
+        self._burst_tx_mv = memoryview(self._burst_tx)
+        self._burst_rx_mv = memoryview(self._burst_rx)
+        self._req_buf = bytearray(1)
+        self._anticoll_buf = bytes((_PICC_ANTICOLL, 0x20))
         self.MFRC522_Init()
 
     def MFRC522_Reset(self):
-        self.Write_MFRC522(self.CommandReg, self.PCD_RESETPHASE)
+        self.Write_MFRC522(_CommandReg, _PCD_RESETPHASE)
 
     def Write_MFRC522(self, addr, val):
+        tx = self._tx
+        tx[0] = (addr << 1) & 0x7E
+        tx[1] = val
         self.cs.value(0)
-        self.spi.write(bytes([(addr << 1) & 0x7E, val]))
+        self.spi.write(tx)
         self.cs.value(1)
 
     def Read_MFRC522(self, addr):
+        tx = self._tx
+        tx[0] = ((addr << 1) & 0x7E) | 0x80
+        tx[1] = 0
+        self.cs.value(0)
+        self.spi.write_readinto(tx, self._rx)
+        self.cs.value(1)
+        return self._rx[1]
+
+    def Write_MFRC522_Burst(self, addr, buf):
+        # The RC522 keeps writing to the same register while CS is held,
+        # so a whole FIFO load is one address byte plus the data
+        self._addr[0] = (addr << 1) & 0x7E
         self.cs.value(0)
-        self.spi.write(bytes([((addr << 1) & 0x7E) | 0x80]))
-        result = self.spi.read(1)
+        self.spi.write(self._addr)
+        self.spi.write(buf)
         self.cs.value(1)
-        return result[0]
+
+    def Read_MFRC522_Burst(self, addr, n):
+        # Repeating the read address clocks out one register value per byte;
+        # the trailing 0x00 ends the frame. Returns a view of a reused buffer,
+        # valid until the next burst read
+        tx = self._burst_tx
+        a = ((addr << 1) & 0x7E) | 0x80
+        for i in range(n):
+            tx[i] = a
+        tx[n] = 0
+        self.cs.value(0)
+        self.spi.write_readinto(self._burst_tx_mv[:n + 1], self._burst_rx_mv[:n + 1])
+        self.cs.value(1)
+        return self._burst_rx_mv[1:n + 1]
 
     def SetBitMask(self, reg, mask):
         tmp = self.Read_MFRC522(reg)
@@ -141,62 +214,78 @@ class MFRC522:
         self.Write_MFRC522(reg, tmp & (~mask))
 
     def AntennaOn(self):
-        temp = self.Read_MFRC522(self.TxControlReg)
-        if(~(temp & 0x03)):
-            self.SetBitMask(self.TxControlReg, 0x03)
+        temp = self.Read_MFRC522(_TxControlReg)
+        if (temp & 0x03) != 0x03:
+            self.SetBitMask(_TxControlReg, 0x03)
 
     def AntennaOff(self):
-        self.ClearBitMask(self.TxControlReg, 0x03)
+        self.ClearBitMask(_TxControlReg, 0x03)
 
     def MFRC522_ToCard(self, command, sendData):
         backData = []
         backLen = 0
-        status = self.MI_ERR
+        status = _MI_ERR
         irqEn = 0x00
         waitIRq = 0x00
         lastBits = None
         n = 0
 
-        if command == self.PCD_AUTHENT:
+        if command == _PCD_AUTHENT:
             irqEn = 0x12
             waitIRq = 0x10
-        if command == self.PCD_TRANSCEIVE:
+        if command == _PCD_TRANSCEIVE:
             irqEn = 0x77
             waitIRq = 0x30
 
-        self.Write_MFRC522(self.CommIEnReg, irqEn | 0x80)
-        self.ClearBitMask(self.CommIrqReg, 0x80)
-        self.SetBitMask(self.FIFOLevelReg, 0x80)
+        # Bound once: the IRQ poll below can spin for hundreds of passes
+        write = self.Write_MFRC522
+        read = self.Read_MFRC522
+        # No hardware-managed CS on the RP2040 port, so CS is driven from here
+        cs_v = self.cs.value
+        xfer = self.spi.write_readinto
+        irq_tx = self._irq_tx
+        rx = self._rx
+
+        write(_CommIEnReg, irqEn | 0x80)
+        # Plain writes, no read-modify-write: with Set1 (bit 7) clear, 0x7F clears
+        # every IRQ flag; FlushBuffer is the only writable bit in FIFOLevelReg
+        write(_CommIrqReg, 0x7F)
+        write(_FIFOLevelReg, 0x80)
 
-        self.Write_MFRC522(self.CommandReg, self.PCD_IDLE)
+        write(_CommandReg, _PCD_IDLE)
 
-        for i in range(len(sendData)):
-            self.Write_MFRC522(self.FIFODataReg, sendData[i])
+        if isinstance(sendData, list):
+            sendData = bytes(sendData)
+        self.Write_MFRC522_Burst(_FIFODataReg, sendData)
 
-        self.Write_MFRC522(self.CommandReg, command)
+        write(_CommandReg, command)
 
-        if command == self.PCD_TRANSCEIVE:
-            self.SetBitMask(self.BitFramingReg, 0x80)
+        if command == _PCD_TRANSCEIVE:
+            self.SetBitMask(_BitFramingReg, 0x80)
 
         i = 2000
         while True:
-            n = self.Read_MFRC522(self.CommIrqReg)
+            cs_v(0)
+            xfer(irq_tx, rx)
+            cs_v(1)
+            n = rx[1]
             i = i - 1
-            if ~((i != 0) and ~(n & 0x01) and ~(n & waitIRq)):
+            # Stop on timeout, timer IRQ, or the command's completion IRQ
+            if i == 0 or (n & 0x01) or (n & waitIRq):
                 break
 
-        self.ClearBitMask(self.BitFramingReg, 0x80)
+        self.ClearBitMask(_BitFramingReg, 0x80)
 
         if i != 0:
-            if (self.Read_MFRC522(self.ErrorReg) & 0x1B) == 0x00:
-                status = self.MI_OK
+            if (read(_ErrorReg) & 0x1B) == 0x00:
+                status = _MI_OK
 
                 if n & irqEn & 0x01:
-                    status = self.MI_NOTAGERR
+                    status = _MI_NOTAGERR
 
-                if command == self.PCD_TRANSCEIVE:
-                    n = self.Read_MFRC522(self.FIFOLevelReg)
-                    lastBits = self.Read_MFRC522(self.ControlReg) & 0x07
+                if command == _PCD_TRANSCEIVE:
+                    n = read(_FIFOLevelReg)
+                    lastBits = read(_ControlReg) & 0x07
                     if lastBits != 0:
                         backLen = (n - 1) * 8 + lastBits
                     else:
@@ -204,28 +293,26 @@ class MFRC522:
 
                     if n == 0:
                         n = 1
-                    if n > self.MAX_LEN:
-                        n = self.MAX_LEN
+                    if n > _MAX_LEN:
+                        n = _MAX_LEN
 
-                    for i in range(n):
-                        backData.append(self.Read_MFRC522(self.FIFODataReg))
+                    backData = list(self.Read_MFRC522_Burst(_FIFODataReg, n))
             else:
-                status = self.MI_ERR
+                status = _MI_ERR
 
         return (status, backData, backLen)
 
     def MFRC522_Request(self, reqMode):
         status = None
         backBits = None
-        TagType = []
 
-        self.Write_MFRC522(self.BitFramingReg, 0x07)
+        self.Write_MFRC522(_BitFramingReg, 0x07)
 
-        TagType.append(reqMode)
-        (status, backData, backBits) = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, TagType)
+        self._req_buf[0] = reqMode
+        (status, backData, backBits) = self.MFRC522_ToCard(_PCD_TRANSCEIVE, self._req_buf)
 
-        if ((status != self.MI_OK) | (backBits != 0x10)):
-            status = self.MI_ERR
+        if ((status != _MI_OK) | (backBits != 0x10)):
+            status = _MI_ERR
 
         return (status, backBits)
 
@@ -233,51 +320,46 @@ class MFRC522:
         backData = []
         serNumCheck = 0
 
-        serNum = []
-
-        self.Write_MFRC522(self.BitFramingReg, 0x00)
+        self.Write_MFRC522(_BitFramingReg, 0x00)
 
-        serNum.append(self.PICC_ANTICOLL)
-        serNum.append(0x20)
+        (status, backData, backBits) = self.MFRC522_ToCard(_PCD_TRANSCEIVE, self._anticoll_buf)
 
-        (status, backData, backBits) = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, serNum)
-
-        if(status == self.MI_OK):
+        if(status == _MI_OK):
             i = 0
             if len(backData) == 5:
                 for i in range(4):
                     serNumCheck = serNumCheck ^ backData[i]
                 if serNumCheck != backData[4]:
-                    status = self.MI_ERR
+                    status = _MI_ERR
             else:
-                status = self.MI_ERR
+                status = _MI_ERR
 
         return (status, backData)
 
     def CalulateCRC(self, pIndata):
-        self.ClearBitMask(self.DivIrqReg, 0x04)
-        self.SetBitMask(self.FIFOLevelReg, 0x80)
+        # Clear just CRCIRq (Set2 = 0) and flush the FIFO without reading first
+        self.Write_MFRC522(_DivIrqReg, 0x04)
+        self.Write_MFRC522(_FIFOLevelReg, 0x80)
 
-        for i in range(len(pIndata)):
-            self.Write_MFRC522(self.FIFODataReg, pIndata[i])
+        self.Write_MFRC522_Burst(_FIFODataReg, bytes(pIndata))
 
-        self.Write_MFRC522(self.CommandReg, self.PCD_CALCCRC)
+        self.Write_MFRC522(_CommandReg, _PCD_CALCCRC)
         i = 0xFF
         while True:
-            n = self.Read_MFRC522(self.DivIrqReg)
+            n = self.Read_MFRC522(_DivIrqReg)
             i = i - 1
             if not ((i != 0) and not (n & 0x04)):
                 break
         pOutData = []
-        pOutData.append(self.Read_MFRC522(self.CRCResultRegL))
-        pOutData.append(self.Read_MFRC522(self.CRCResultRegM))
+        pOutData.append(self.Read_MFRC522(_CRCResultRegL))
+        pOutData.append(self.Read_MFRC522(_CRCResultRegM))
         return pOutData
 
     def MFRC522_Init(self):
         self.MFRC522_Reset()
         
         # Add version check
-        version = self.Read_MFRC522(self.VersionReg)
+        version = self.Read_MFRC522(_VersionReg)
         print(f"MFRC522 Version: 0x{version:02x}")
         
         # Update version check to include 0x82
@@ -287,14 +369,14 @@ class MFRC522:
             print("Valid MFRC522 version detected")
 
         # Configure timer
-        self.Write_MFRC522(self.TModeReg, 0x8D)        # Tauto=1; f(Timer) = 6.78MHz/TPreScaler
-        self.Write_MFRC522(self.TPrescalerReg, 0x3E)   # TModeReg[3..0] + TPrescalerReg
-        self.Write_MFRC522(self.TReloadRegL, 30)       
-        self.Write_MFRC522(self.TReloadRegH, 0)
+        self.Write_MFRC522(_TModeReg, 0x8D)        # Tauto=1; f(Timer) = 6.78MHz/TPreScaler
+        self.Write_MFRC522(_TPrescalerReg, 0x3E)   # TModeReg[3..0] + TPrescalerReg
+        self.Write_MFRC522(_TReloadRegL, 30)       
+        self.Write_MFRC522(_TReloadRegH, 0)
 
         # Configure modulation
-        self.Write_MFRC522(self.TxAutoReg, 0x40)    # 100%ASK
-        self.Write_MFRC522(self.ModeReg, 0x3D)      # CRC initial value 0x6363
+        self.Write_MFRC522(_TxAutoReg, 0x40)    # 100%ASK
+        self.Write_MFRC522(_ModeReg, 0x3D)      # CRC initial value 0x6363
 
         # Turn on the antenna
         self.AntennaOn()
@@ -314,9 +396,10 @@ def main():
         cs.value(1)  # CS must be high initially
         sck.value(0)  # Clock low initially
         
-        # Initialize SPI with lower baudrate and mode 0
+        # Initialize SPI in mode 0; the RC522 is rated to 10MHz
+        baudrate = 8000000
         spi = SPI(0,
-                baudrate=1000000,  # 1MHz
+                baudrate=baudrate,  # 8MHz
                 polarity=0,
                 phase=0,
                 bits=8,
@@ -332,6 +415,14 @@ def main():
         print("Initializing MFRC522...")
         rfid = MFRC522(spi, cs)
         
+        # Long jumper leads can't always carry 8MHz; VersionReg then reads
+        # 0x00/0xFF, so halve the clock once and re-initialise
+        if rfid.Read_MFRC522(rfid.VersionReg) in (0x00, 0xFF):
+            baudrate //= 2
+            print(f"No response at 8MHz, retrying at {baudrate // 1000000}MHz")
+            spi.init(baudrate=baudrate)
+            rfid.MFRC522_Init()
+        
         # Read version register multiple times to ensure communication
         versions = []
         for i in range(3):
@@ -386,11 +477,8 @@ def main():
                         (status, uid) = rfid.MFRC522_Anticoll()
                         
                         if status == rfid.MI_OK:
-                            # Print the UID
-                            print("Card UID: ", end="")
-                            for i in range(0, len(uid)-1):
-                                print(f"{uid[i]:02x}", end=":")
-                            print(f"{uid[-1]:02x}")
+                            # Print the UID (Anticoll only succeeds with 5 bytes: UID + BCC)
+                            print(f"Card UID: {uid[0]:02x}:{uid[1]:02x}:{uid[2]:02x}:{uid[3]:02x}:{uid[4]:02x}")
                             last_read_time = current_time
                             
                             # Keep LED on for a moment